@@ -15,6 +15,7 @@ if [ -n "$DATABASE_URL" ]; then
     echo "Running database migrations..."
     python manage.py migrate --no-input
     echo "Migrations complete!"
+    python manage.py rebuild_search_index --if-empty
 fi
 
 echo "Build complete!"
@@ -27,6 +27,26 @@ else:
 
 ADMIN_PATH = os.environ.get('ADMIN_PATH', 'admin/')
 
+# Full-page cache for public views, invalidated by content changes (off by default in DEBUG)
+PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', str(not DEBUG)).lower() in ('true', '1', 'yes')
+# Upper bound on how long a cached page is kept; content changes invalidate it sooner
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', '86400'))
+
+# Identifies the deployed code, so cached pages and ETags change on deploy
+RELEASE = os.environ.get('RENDER_GIT_COMMIT', '')
+
+# Set by export_static while it renders pages, which then leave out query-string links
+STATIC_EXPORT = False
+
+# Per-request timing: Server-Timing header, and a warning log for requests slower than this
+SERVER_TIMING = os.environ.get('SERVER_TIMING', 'True').lower() in ('true', '1', 'yes')
+SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', '500'))
+
+# GitHub account whose contributions are shown on the site
+GITHUB_USERNAME = os.environ.get('GITHUB_USERNAME', 'bradshawrc93')
+# Point sync_github at a stand-in server (e.g. the fake_github command) instead of GitHub
+GITHUB_API_URL = os.environ.get('GITHUB_API_URL', 'https://api.github.com')
+
 # Application definition
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -38,9 +58,11 @@ INSTALLED_APPS = [
     'core',
     'devlog',
     'githubsync',
+    'search',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -55,7 +77,7 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.timing.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -64,6 +86,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.static_export',
             ],
         },
     },
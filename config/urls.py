@@ -6,6 +6,7 @@ from django.conf import settings
 urlpatterns = [
     path('', include('core.urls')),
     path('devlog/', include('devlog.urls')),
+    path('search/', include('search.urls')),
     path(f'{settings.ADMIN_PATH}', admin.site.urls),
 ]
 
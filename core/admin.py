@@ -1,13 +1,21 @@
 from django.contrib import admin
-from .models import Project
+from .models import ActivityFeedEntry, Project, Tag
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    search_fields = ('name',)
+    prepopulated_fields = {'slug': ('name',)}
 
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
     list_display = ('title', 'slug', 'repo_full_name', 'status', 'featured', 'sort_order', 'created_at')
     list_filter = ('status', 'featured', 'created_at')
-    search_fields = ('title', 'tagline', 'repo_full_name', 'stack')
+    search_fields = ('title', 'tagline', 'repo_full_name', 'stack__name')
     prepopulated_fields = {'slug': ('title',)}
+    autocomplete_fields = ('stack',)
     list_editable = ('featured', 'sort_order', 'status')
     ordering = ('sort_order', 'title')
     
@@ -26,3 +34,11 @@ class ProjectAdmin(admin.ModelAdmin):
     
     readonly_fields = ('created_at', 'updated_at')
 
+
+@admin.register(ActivityFeedEntry)
+class ActivityFeedEntryAdmin(admin.ModelAdmin):
+    list_display = ('title', 'kind', 'occurred_at', 'description')
+    list_filter = ('kind', 'occurred_at')
+    search_fields = ('title', 'description', 'key')
+    ordering = ('-occurred_at', '-id')
+    raw_id_fields = ('project', 'post')
@@ -0,0 +1,35 @@
+"""
+Conditional GET support for the public views.
+
+The ETag and Last-Modified validators come from the page's content state, so
+a matching If-None-Match/If-Modified-Since is answered with a 304 after one
+small query, before the view does any work.
+"""
+
+from functools import wraps
+
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from core.versioning import get_content_state
+
+
+def conditional_page(*scopes):
+    """Answer conditional GETs for a page built from ``scopes`` with 304s."""
+    def etag(request, *args, **kwargs):
+        return get_content_state(request, scopes).key
+
+    def last_modified(request, *args, **kwargs):
+        return get_content_state(request, scopes).last_modified
+
+    def decorator(view):
+        conditional_view = condition(etag_func=etag, last_modified_func=last_modified)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            # Let browsers and proxies store the page but revalidate it on every use
+            patch_cache_control(response, no_cache=True)
+            return response
+        return wrapper
+    return decorator
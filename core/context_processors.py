@@ -0,0 +1,11 @@
+from django.conf import settings
+
+
+def static_export(request):
+    """Expose whether pages are being rendered by ``export_static``.
+
+    Static hosts ignore query strings, so templates hide the year, range and
+    sort switches, which only change the query, when this is set. Pagination
+    links point at each page's exported path instead (see core.pagination).
+    """
+    return {'static_export': settings.STATIC_EXPORT}
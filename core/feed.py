@@ -0,0 +1,130 @@
+"""
+The site's activity feed: new projects, published devlog posts, pushes to
+project repos and star milestones.
+
+Each item is an ``ActivityFeedEntry`` written when what it describes changes:
+by the ``Project`` and ``DevlogPost`` save signals and by sync_github when a
+repo's push time or star count moves. Entries carry everything a feed item
+shows and a real timestamp, so pages read them newest first with a single
+query on the ``(occurred_at, id)`` index instead of merging and sorting
+models in Python. New kinds of events only need a new ``kind`` and a writer.
+
+Every entry has a unique ``key`` naming its subject, so writers upsert rather
+than duplicate. Entries of a project or post are deleted with it, and saving a
+project refreshes the title and URL on all of its entries.
+"""
+
+from core.models import ActivityFeedEntry, ContentVersion
+
+# Star counts that get a feed entry when a repo reaches them
+STAR_MILESTONES = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def latest_entries(limit=10):
+    """Return the ``limit`` most recent entries."""
+    return ActivityFeedEntry.objects.order_by('-occurred_at', '-id')[:limit]
+
+
+def project_entry(project):
+    """Return the unsaved entry announcing ``project``."""
+    return ActivityFeedEntry(
+        key=f'project:{project.pk}',
+        kind=ActivityFeedEntry.PROJECT,
+        title=project.title,
+        url=project.get_absolute_url(),
+        description=project.tagline,
+        occurred_at=project.created_at,
+        project=project,
+    )
+
+
+def post_entry(post):
+    """Return the unsaved entry announcing ``post``."""
+    return ActivityFeedEntry(
+        key=f'devlog:{post.pk}',
+        kind=ActivityFeedEntry.DEVLOG,
+        title=post.title,
+        url=post.get_absolute_url(),
+        occurred_at=post.published_at,
+        post=post,
+    )
+
+
+def save_entry(entry):
+    """Insert ``entry``, or update the existing entry with its key."""
+    fields = {
+        field.name: getattr(entry, field.name)
+        for field in ActivityFeedEntry._meta.concrete_fields
+        if field.name not in ('id', 'key')
+    }
+    return ActivityFeedEntry.objects.update_or_create(key=entry.key, defaults=fields)
+
+
+def update_project_entries(project):
+    """
+    Add or refresh ``project``'s entry; drop all of its entries while it isn't active.
+
+    Push and star entries copy the project's title and URL too, so they're
+    brought up to date after a rename or a slug change.
+    """
+    entries = ActivityFeedEntry.objects.filter(project=project)
+    if project.status != 'active':
+        entries.delete()
+        return
+    entry = save_entry(project_entry(project))[0]
+    entries.exclude(title=entry.title, url=entry.url).update(title=entry.title, url=entry.url)
+
+
+def update_post_entry(post):
+    """Add or refresh ``post``'s entry while it's published; drop it otherwise."""
+    if not post.is_published:
+        ActivityFeedEntry.objects.filter(key=f'devlog:{post.pk}').delete()
+    else:
+        save_entry(post_entry(post))
+
+
+def push_entry(project, pushed_at):
+    """Return the unsaved entry for pushes to ``project``'s repo on the day of ``pushed_at``."""
+    return ActivityFeedEntry(
+        key=f'push:{project.pk}:{pushed_at.date().isoformat()}',
+        kind=ActivityFeedEntry.PUSH,
+        title=project.title,
+        url=project.get_absolute_url(),
+        description=f'Pushed to {project.repo_full_name}',
+        occurred_at=pushed_at,
+        project=project,
+    )
+
+
+def record_push(project, pushed_at):
+    """Record a push to ``project``'s repo; pushes on the same day share one entry, dated by the latest."""
+    save_entry(push_entry(project, pushed_at))
+
+
+def star_milestones(previous, current):
+    """Return the milestones a star count passed going from ``previous`` to ``current``."""
+    return [milestone for milestone in STAR_MILESTONES if previous < milestone <= current]
+
+
+def record_star_milestones(project, previous, current, occurred_at):
+    """Record every star milestone ``project``'s repo passed; return how many are new."""
+    created = 0
+    for milestone in star_milestones(previous, current):
+        _, new = ActivityFeedEntry.objects.get_or_create(
+            key=f'stars:{project.pk}:{milestone}',
+            defaults={
+                'kind': ActivityFeedEntry.STARS,
+                'title': project.title,
+                'url': project.get_absolute_url(),
+                'description': f'Reached {milestone} stars on GitHub',
+                'occurred_at': occurred_at,
+                'project': project,
+            },
+        )
+        created += new
+    return created
+
+
+def invalidate_feed():
+    """Invalidate cached pages showing the feed; call after writing entries outside the model signals."""
+    ContentVersion.bump(ContentVersion.FEED)
@@ -0,0 +1,231 @@
+"""
+Management command to benchmark the public views.
+
+Each view is requested repeatedly through the test client (the full
+middleware, view and template stack, without a network or WSGI server) and
+its latency percentiles and query count are reported. The page cache is off
+unless --page-cache is given, so the numbers measure the work a cache miss
+does; lower-level caches such as the heatmap stay on, as they are in
+production.
+
+Run it against a large dataset from ``seed_benchmark_data``. With
+--write-baseline the results are saved as JSON; with --baseline they're
+compared against a saved file and the command fails if any view makes more
+queries than before or got slower than the tolerance allows, so CI can flag
+regressions.
+"""
+
+import json
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from core.management.commands.seed_benchmark_data import DEFAULT_USERNAME, SLUG_PREFIX
+from core.models import Project, Tag
+from devlog.models import DevlogPost
+from githubsync.metrics import percentile
+
+VIEWS = [
+    'home', 'activity', 'project_list', 'project_detail', 'project_detail_all', 'devlog_list', 'devlog_detail',
+    'tag_list', 'tag_detail',
+]
+# Benchmarked views that are another view with a query string
+VARIANTS = {'project_detail_all': ('project_detail', '?range=all')}
+# Latency differences below this are noise, whatever the tolerance
+LATENCY_SLACK_MS = 2.0
+
+
+class Command(BaseCommand):
+    help = 'Measure latency percentiles and query counts of the public views'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--views',
+            nargs='+',
+            choices=VIEWS,
+            default=VIEWS,
+            help='Views to benchmark (default: all)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=30,
+            help='Timed requests per view (default: 30)',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=3,
+            help='Untimed requests per view first, to fill caches and connections (default: 3)',
+        )
+        parser.add_argument(
+            '--username',
+            default=DEFAULT_USERNAME,
+            help=f'GitHub username whose heatmap is shown (default: {DEFAULT_USERNAME}, as seeded)',
+        )
+        parser.add_argument(
+            '--page-cache',
+            action='store_true',
+            help='Leave the full-page cache on (measures cache hits instead of rendering)',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Write the results as JSON to this file',
+        )
+        parser.add_argument(
+            '--baseline',
+            type=str,
+            help='Compare against results saved earlier and fail on regressions',
+        )
+        parser.add_argument(
+            '--write-baseline',
+            type=str,
+            help='Save the results as a new baseline file',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.5,
+            help='Allowed p50 latency increase over the baseline, as a fraction (default: 0.5)',
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+
+        paths = self.get_paths(options['views'])
+        overrides = {
+            'GITHUB_USERNAME': options['username'],
+            'PAGE_CACHE_ENABLED': options['page_cache'],
+            'SLOW_REQUEST_MS': float('inf'),
+        }
+        with override_settings(**overrides):
+            client = Client(HTTP_HOST=self.get_host())
+            results = {
+                view: self.measure(client, path, options['warmup'], options['iterations'])
+                for view, path in paths.items()
+            }
+
+        self.print_results(results)
+        report = {
+            'database': connection.vendor,
+            'page_cache': options['page_cache'],
+            'iterations': options['iterations'],
+            'views': results,
+        }
+        for path in (options['output'], options['write_baseline']):
+            if path:
+                Path(path).write_text(json.dumps(report, indent=2, sort_keys=True) + '\n')
+                self.stdout.write(f'Wrote results to {path}')
+
+        if options['baseline']:
+            baseline = json.loads(Path(options['baseline']).read_text())
+            if baseline.get('database') != connection.vendor:
+                raise CommandError(
+                    f'{options["baseline"]} was recorded on {baseline.get("database")}, not {connection.vendor}; '
+                    'record the baseline on the database it is checked against'
+                )
+            regressions = self.compare(results, baseline['views'], options['tolerance'])
+            if regressions:
+                for message in regressions:
+                    self.stdout.write(self.style.ERROR(f'  {message}'))
+                raise CommandError(f'{len(regressions)} regressions against {options["baseline"]}')
+            self.stdout.write(self.style.SUCCESS(f'No regressions against {options["baseline"]}'))
+
+    def get_host(self):
+        for host in settings.ALLOWED_HOSTS:
+            if host != '*' and not host.startswith('.'):
+                return host
+        return 'localhost'
+
+    def get_paths(self, views):
+        """Return ``{view: path}``, preferring seeded objects for the detail pages."""
+        paths = {}
+        for name in views:
+            view, query = VARIANTS.get(name, (name, ''))
+            if view == 'project_detail':
+                projects = Project.objects.filter(status='active')
+                project = (
+                    projects.filter(slug__startswith=SLUG_PREFIX).order_by('slug').first()
+                    or projects.order_by('sort_order', 'title').first()
+                )
+                slug = project.slug if project else None
+            elif view == 'devlog_detail':
+                posts = DevlogPost.objects.filter(status='published', published_at__isnull=False)
+                post = (
+                    posts.filter(slug__startswith=SLUG_PREFIX).order_by('-published_at').first()
+                    or posts.order_by('-published_at').first()
+                )
+                slug = post.slug if post else None
+            elif view == 'tag_detail':
+                # The busiest tag is the worst case
+                tag = Tag.objects.annotate(uses=Count('devlog_posts')).order_by('-uses', 'name').first()
+                slug = tag.slug if tag else None
+            else:
+                paths[name] = reverse(view) + query
+                continue
+
+            if slug is None:
+                self.stdout.write(self.style.WARNING(f'Skipping {name}: nothing to show (run seed_benchmark_data)'))
+                continue
+            paths[name] = reverse(view, kwargs={'slug': slug}) + query
+        return paths
+
+    def measure(self, client, path, warmup, iterations):
+        for _ in range(warmup):
+            self.get(client, path)
+
+        latencies, queries = [], []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                self.get(client, path)
+                latencies.append(time.perf_counter() - started)
+            queries.append(len(captured))
+
+        return {
+            'path': path,
+            'p50_ms': round(percentile(latencies, 0.5) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'max_ms': round(max(latencies) * 1000, 2),
+            'queries': max(queries),
+        }
+
+    def get(self, client, path):
+        response = client.get(path, secure=True)
+        if response.status_code != 200:
+            raise CommandError(f'{path} returned {response.status_code}')
+        return response
+
+    def print_results(self, results):
+        self.stdout.write(f'{"view":<20} {"p50 ms":>9} {"p95 ms":>9} {"max ms":>9} {"queries":>8}  path')
+        for view, result in results.items():
+            self.stdout.write(
+                f'{view:<20} {result["p50_ms"]:>9.2f} {result["p95_ms"]:>9.2f} {result["max_ms"]:>9.2f} '
+                f'{result["queries"]:>8}  {result["path"]}'
+            )
+
+    def compare(self, results, baseline, tolerance):
+        """Return a message for every view that regressed against ``baseline``."""
+        regressions = []
+        for view, result in results.items():
+            expected = baseline.get(view)
+            if expected is None:
+                continue
+            if result['queries'] > expected['queries']:
+                regressions.append(f'{view}: {result["queries"]} queries (baseline {expected["queries"]})')
+            allowed = max(expected['p50_ms'] * (1 + tolerance), expected['p50_ms'] + LATENCY_SLACK_MS)
+            if result['p50_ms'] > allowed:
+                regressions.append(
+                    f'{view}: p50 {result["p50_ms"]:.2f}ms (baseline {expected["p50_ms"]:.2f}ms, '
+                    f'allowed {allowed:.2f}ms)'
+                )
+        return regressions
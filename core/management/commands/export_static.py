@@ -0,0 +1,197 @@
+"""
+Management command to export the public site as static HTML files.
+
+Every public page is requested through the regular URLconf, views and
+templates, and written to ``<output>/<path>/index.html`` so any plain file
+server or CDN can serve the site. Pages are rendered with ``STATIC_EXPORT``
+set: static hosts ignore query strings, so lists are exported page by page to
+``<list>/page/<n>/`` and link there, and switches that only change the query
+(year, range, sort) are left out.
+
+Rebuilds are incremental: a manifest in the output directory records each
+page's ETag and content hash. Pages are requested with If-None-Match, so a
+page whose inputs haven't changed comes back as a 304 and isn't rendered or
+rewritten.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.test import Client, override_settings
+from django.urls import reverse
+from core.models import Project, Tag
+from core.pagination import export_page_path
+from devlog.models import DevlogPost
+
+MANIFEST_NAME = '.export-manifest.json'
+
+# Outcomes of exporting a page
+WRITTEN = 'written'
+UNCHANGED = 'unchanged'
+
+
+class Command(BaseCommand):
+    help = 'Export public pages to a directory of static HTML files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=str(settings.BASE_DIR / 'site'),
+            help='Directory to write the site to (default: ./site)',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Ignore the manifest and re-render every page',
+        )
+        parser.add_argument(
+            '--no-static',
+            action='store_true',
+            help="Don't copy static assets (CSS) into the export",
+        )
+
+    def handle(self, *args, **options):
+        with override_settings(STATIC_EXPORT=True):
+            self.export(options)
+
+    def export(self, options):
+        output = Path(options['output'])
+        output.mkdir(parents=True, exist_ok=True)
+        manifest_path = output / MANIFEST_NAME
+        manifest = {}
+        if manifest_path.exists() and not options['full']:
+            manifest = json.loads(manifest_path.read_text())
+
+        client = Client(HTTP_HOST=self.get_host())
+        written = unchanged = 0
+        pages = []
+
+        for path, paginated in self.get_pages():
+            number = 1
+            while True:
+                page_path = export_page_path(path, number)
+                url = path if number == 1 else f'{path}?page={number}'
+                outcome = self.export_page(client, output, manifest, page_path, url, missing_ok=number > 1)
+                if outcome is None:
+                    # Past the list's last page
+                    break
+                pages.append(page_path)
+                if outcome == WRITTEN:
+                    written += 1
+                else:
+                    unchanged += 1
+                if not paginated:
+                    break
+                number += 1
+
+        removed = 0
+        for path in set(manifest) - set(pages):
+            self.page_file(output, path).unlink(missing_ok=True)
+            del manifest[path]
+            removed += 1
+
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+        copied = 0 if options['no_static'] else self.copy_static(output)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {len(pages)} pages to {output}: {written} written, {unchanged} unchanged, '
+            f'{removed} removed, {copied} static files copied'
+        ))
+
+    def export_page(self, client, output, manifest, path, url, missing_ok=False):
+        """Write the page at ``url`` to ``path``'s file; return WRITTEN, UNCHANGED or, for a 404 if ``missing_ok``, None."""
+        target = self.page_file(output, path)
+        entry = manifest.get(path)
+        headers = {}
+        if entry and target.exists():
+            headers['HTTP_IF_NONE_MATCH'] = entry['etag']
+
+        response = client.get(url, secure=True, **headers)
+        if response.status_code == 304:
+            return UNCHANGED
+        if response.status_code == 404 and missing_ok:
+            return None
+        if response.status_code != 200:
+            raise CommandError(f'{url} returned {response.status_code}')
+
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        manifest[path] = {'etag': response.get('ETag', ''), 'sha256': content_hash}
+        if entry and entry['sha256'] == content_hash and target.exists():
+            return UNCHANGED
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix('.tmp')
+        tmp.write_bytes(response.content)
+        os.replace(tmp, target)
+        return WRITTEN
+
+    def get_host(self):
+        for host in settings.ALLOWED_HOSTS:
+            if host != '*' and not host.startswith('.'):
+                return host
+        return 'localhost'
+
+    def get_pages(self):
+        """Return ``(path, paginated)`` for every public page; paginated lists are exported page by page."""
+        pages = [(reverse('home'), False), (reverse('tag_list'), False)]
+        pages += [(reverse(name), True) for name in ('activity', 'project_list', 'devlog_list')]
+        pages += [
+            (reverse('project_detail', kwargs={'slug': slug}), False)
+            for slug in Project.objects.filter(status='active').values_list('slug', flat=True)
+        ]
+        pages += [
+            (reverse('devlog_detail', kwargs={'slug': slug}), False)
+            for slug in DevlogPost.objects.filter(
+                status='published',
+                published_at__isnull=False
+            ).values_list('slug', flat=True)
+        ]
+        pages += [
+            (reverse('tag_detail', kwargs={'slug': slug}), True)
+            for slug in Tag.objects.filter(
+                Q(projects__status='active') | Q(devlog_posts__status='published', devlog_posts__published_at__isnull=False)
+            ).distinct().values_list('slug', flat=True)
+        ]
+        return pages
+
+    def page_file(self, output, path):
+        return output / path.strip('/') / 'index.html'
+
+    def copy_static(self, output):
+        """Mirror static assets into the export, copying only new or changed files."""
+        static_dir = output / settings.STATIC_URL.strip('/')
+        if Path(settings.STATIC_ROOT).is_dir():
+            # Collected files include the hashed names the templates reference
+            sources = (
+                (Path(root) / name, (Path(root) / name).relative_to(settings.STATIC_ROOT))
+                for root, _, names in os.walk(settings.STATIC_ROOT)
+                for name in names
+            )
+        else:
+            sources = (
+                (Path(storage.path(path)), Path(path))
+                for finder in finders.get_finders()
+                for path, storage in finder.list([])
+            )
+
+        copied = 0
+        for source, relative in sources:
+            if relative.parts[0] == 'admin':
+                continue
+            target = static_dir / relative
+            source_stat = source.stat()
+            if target.exists():
+                target_stat = target.stat()
+                if target_stat.st_size == source_stat.st_size and target_stat.st_mtime >= source_stat.st_mtime:
+                    continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+            copied += 1
+        return copied
@@ -0,0 +1,291 @@
+"""
+Management command to fill the database with synthetic data for benchmarks.
+
+Generates projects with repo snapshots and daily activity, devlog posts,
+tags and several years of contribution days at sizes well beyond the real
+site's, so slow queries and per-row work show up in ``benchmark_views``.
+
+Every generated row is recognisable (slugs start with ``bench-``, repos with
+``bench/``, contributions belong to ``--username``) and ``--clear`` deletes
+exactly those rows. Rows are written with bulk_create, so model signals don't
+run: the search index isn't updated (run ``rebuild_search_index`` if you want
+to benchmark search), the activity feed is written here in bulk and the
+content versions are bumped once at the end.
+Markdown is rendered once per distinct body and stored with its hash, so the
+pages serve pre-rendered HTML just like real content. The weekly and monthly
+rollups of the activity and contribution days are rebuilt from them.
+"""
+
+import random
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from core.feed import post_entry, project_entry, push_entry
+from core.models import ActivityFeedEntry, ContentVersion, Project, Tag
+from core.rendering import DEVLOG_EXTENSIONS, README_EXTENSIONS, render_hash, render_markdown
+from devlog.models import DevlogPost
+from githubsync.models import (
+    RepoActivityPoint, RepoActivityRollup, RepoSnapshot, UserContributionDay, UserContributionRollup,
+)
+from githubsync.rollups import rebuild_activity, rebuild_contributions
+from githubsync.sparkline import render_sparkline
+
+SLUG_PREFIX = 'bench-'
+REPO_OWNER = 'bench'
+DEFAULT_USERNAME = 'bench-user'
+BATCH_SIZE = 2000
+CONTENT_SCOPES = (
+    ContentVersion.PROJECTS,
+    ContentVersion.DEVLOG,
+    ContentVersion.CONTRIBUTIONS,
+    ContentVersion.GITHUB,
+    ContentVersion.FEED,
+)
+
+TAG_NAMES = [
+    'Python', 'Django', 'PostgreSQL', 'SQLite', 'Redis', 'Celery', 'JavaScript', 'TypeScript', 'React',
+    'Vue', 'Svelte', 'HTMX', 'Go', 'Rust', 'C', 'C++', 'Docker', 'Kubernetes', 'Terraform', 'AWS',
+    'GraphQL', 'REST', 'WebSockets', 'Markdown', 'CSS', 'Tailwind', 'Pandas', 'NumPy', 'FastAPI', 'Flask',
+]
+LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'C', 'HTML', None]
+WORDS = (
+    'cache query index render sync profile latency batch worker queue schema migration template '
+    'heatmap snapshot feed parser token budget request response page keyset cursor signal'
+).split()
+
+README_BODIES = [
+    '# {title}\n\n{sentence}\n\n## Install\n\n```bash\npip install -r requirements.txt\npython manage.py migrate\n```\n\n'
+    '## Usage\n\n| Command | Description |\n| --- | --- |\n| `run` | Start the server |\n| `sync` | Fetch data |\n',
+    '# {title}\n\n{sentence}\n\n```python\ndef handler(event):\n    for item in event["items"]:\n'
+    '        process(item)\n    return len(event["items"])\n```\n\n- Fast\n- Small\n- Tested\n',
+    '# {title}\n\n{sentence}\n\n## Notes\n\n{sentence}\n\n1. Clone the repo\n2. Run `make`\n3. Open a PR\n',
+]
+POST_BODIES = [
+    '{sentence}\n\n## What changed\n\n{sentence}\n\n```python\nresults = (\n    Model.objects.filter(active=True)\n'
+    '    .select_related("owner")\n    .order_by("-created_at")[:20]\n)\n```\n\n{sentence}\n',
+    '{sentence}\n\n- {sentence}\n- {sentence}\n- {sentence}\n\n| Before | After |\n| --- | --- |\n| 120ms | 35ms |\n',
+    '{sentence}\n\n### Why\n\n{sentence}\n\n```sql\nSELECT day, SUM(commits) FROM activity GROUP BY day ORDER BY day;\n```\n',
+    '{sentence}\n\n{sentence}\n\n{sentence}\n',
+]
+
+
+class Command(BaseCommand):
+    help = 'Generate a large synthetic dataset for benchmarking the public views'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=1000, help='Projects to create (default: 1000)')
+        parser.add_argument('--posts', type=int, default=20000, help='Devlog posts to create (default: 20000)')
+        parser.add_argument(
+            '--years',
+            type=int,
+            default=3,
+            help='Years of contribution days, and the span posts are published over (default: 3)',
+        )
+        parser.add_argument(
+            '--activity-days',
+            type=int,
+            default=365,
+            help='Days of commit activity per repo (default: 365)',
+        )
+        parser.add_argument(
+            '--username',
+            default=DEFAULT_USERNAME,
+            help=f'GitHub username the contribution days belong to (default: {DEFAULT_USERNAME})',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, for reproducible data (default: 0)')
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete previously generated benchmark data first',
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.today = timezone.now().date()
+
+        with transaction.atomic():
+            if options['clear']:
+                self.clear(options['username'])
+            elif Project.objects.filter(slug__startswith=SLUG_PREFIX).exists():
+                raise CommandError('Benchmark data already exists; pass --clear to replace it')
+
+            tags = self.create_tags()
+            projects = self.create_projects(options['projects'], tags)
+            activity = self.create_activity(projects, options['activity_days'])
+            snapshots = self.create_snapshots(projects, activity)
+            posts = self.create_posts(options['posts'], options['years'], projects, tags)
+            self.create_feed(projects, snapshots)
+            contributions = self.create_contributions(options['username'], options['years'])
+            rebuild_activity(list(activity))
+            rebuild_contributions([options['username']])
+            ContentVersion.bump(*CONTENT_SCOPES)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(projects)} projects, {len(posts)} devlog posts, '
+            f'{sum(map(len, activity.values()))} activity points and '
+            f'{contributions} contribution days for {options["username"]}'
+        ))
+
+    def clear(self, username):
+        deleted = sum([
+            DevlogPost.objects.filter(slug__startswith=SLUG_PREFIX).delete()[0],
+            Project.objects.filter(slug__startswith=SLUG_PREFIX).delete()[0],
+            RepoSnapshot.objects.filter(repo_full_name__startswith=f'{REPO_OWNER}/').delete()[0],
+            RepoActivityPoint.objects.filter(repo_full_name__startswith=f'{REPO_OWNER}/').delete()[0],
+            RepoActivityRollup.objects.filter(repo_full_name__startswith=f'{REPO_OWNER}/').delete()[0],
+            UserContributionDay.objects.filter(username=username).delete()[0],
+            UserContributionRollup.objects.filter(username=username).delete()[0],
+        ])
+        self.stdout.write(f'Deleted {deleted} rows of previous benchmark data')
+
+    def sentence(self, words=12):
+        text = ' '.join(self.random.choice(WORDS) for _ in range(words))
+        return f'{text.capitalize()}.'
+
+    def render_pool(self, bodies, extensions, title):
+        """Render each body template once; return ``[(markdown, html, hash)]``."""
+        pool = []
+        for body in bodies:
+            text = body.format(title=title, sentence=self.sentence(20))
+            pool.append((text, render_markdown(text, extensions), render_hash(text, extensions)))
+        return pool
+
+    def create_tags(self):
+        tags = []
+        for name in TAG_NAMES:
+            tag, _ = Tag.objects.get_or_create(name=name)
+            tags.append(tag)
+        return tags
+
+    def create_projects(self, count, tags):
+        now = timezone.now()
+        Project.objects.bulk_create([
+            Project(
+                title=f'Benchmark Project {number}',
+                slug=f'{SLUG_PREFIX}project-{number:05d}',
+                repo_full_name=f'{REPO_OWNER}/repo-{number:05d}',
+                tagline=self.sentence(8),
+                featured=number <= 6,
+                status='archived' if number % 10 == 0 else 'active',
+                sort_order=number,
+            )
+            for number in range(1, count + 1)
+        ], batch_size=BATCH_SIZE)
+        # bulk_create doesn't return primary keys on every backend
+        projects = list(Project.objects.filter(slug__startswith=SLUG_PREFIX).order_by('sort_order'))
+        # Spread creation dates so the activity feed has something to sort
+        for offset, project in enumerate(projects):
+            project.created_at = now - timedelta(hours=offset)
+        Project.objects.bulk_update(projects, ['created_at'], batch_size=BATCH_SIZE)
+
+        Project.stack.through.objects.bulk_create([
+            Project.stack.through(project_id=project.pk, tag_id=tag.pk)
+            for project in projects
+            for tag in self.random.sample(tags, 3)
+        ], batch_size=BATCH_SIZE)
+        return projects
+
+    def create_snapshots(self, projects, activity):
+        readmes = self.render_pool(README_BODIES, README_EXTENSIONS, 'Benchmark Project')
+        now = timezone.now()
+        snapshots = []
+        for project in projects:
+            readme, readme_html, readme_hash = self.random.choice(readmes)
+            activity_svg, activity_total = render_sparkline(activity[project.repo_full_name], self.today)
+            snapshots.append(RepoSnapshot(
+                repo_full_name=project.repo_full_name,
+                description=project.tagline,
+                language=self.random.choice(LANGUAGES),
+                stars=int(self.random.paretovariate(1.2)) - 1,
+                forks=self.random.randint(0, 20),
+                open_issues=self.random.randint(0, 30),
+                pushed_at=now - timedelta(minutes=self.random.randint(0, 60 * 24 * 365)),
+                readme_content=readme,
+                readme_html=readme_html,
+                readme_hash=readme_hash,
+                activity_svg=activity_svg,
+                activity_total=activity_total,
+                activity_end=self.today,
+            ))
+        RepoSnapshot.objects.bulk_create(snapshots, batch_size=BATCH_SIZE)
+        # Project.save() would have linked them
+        Project.objects.filter(slug__startswith=SLUG_PREFIX).update(repo_snapshot=Subquery(
+            RepoSnapshot.objects.filter(repo_full_name=OuterRef('repo_full_name')).values('pk')[:1]
+        ))
+        return snapshots
+
+    def create_activity(self, projects, days):
+        """Create daily commit counts for each project's repo; return ``{repo: {day: commits}}``."""
+        start = self.today - timedelta(days=days - 1)
+        activity = {
+            project.repo_full_name: {
+                start + timedelta(days=offset): self.random.choice([0, 0, 0, 1, 2, 3, 5, 8])
+                for offset in range(days)
+            }
+            for project in projects
+        }
+        RepoActivityPoint.objects.bulk_create([
+            RepoActivityPoint(repo_full_name=repo_full_name, day=day, commits=commits)
+            for repo_full_name, days_commits in activity.items()
+            for day, commits in days_commits.items()
+        ], batch_size=BATCH_SIZE)
+        return activity
+
+    def create_posts(self, count, years, projects, tags):
+        bodies = self.render_pool(POST_BODIES, DEVLOG_EXTENSIONS, 'Benchmark Post')
+        now = timezone.now()
+        span = timedelta(days=365 * years)
+        posts = []
+        for number in range(1, count + 1):
+            content_md, content_html, content_hash = self.random.choice(bodies)
+            published = number % 25 != 0
+            posts.append(DevlogPost(
+                title=f'Benchmark post {number}: {self.sentence(5)[:-1]}',
+                slug=f'{SLUG_PREFIX}post-{number:06d}',
+                content_md=content_md,
+                content_html=content_html,
+                content_hash=content_hash,
+                status='published' if published else 'draft',
+                published_at=now - span * self.random.random() if published else None,
+                project=self.random.choice(projects) if projects and self.random.random() < 0.7 else None,
+            ))
+        DevlogPost.objects.bulk_create(posts, batch_size=BATCH_SIZE)
+
+        post_ids = DevlogPost.objects.filter(slug__startswith=SLUG_PREFIX).values_list('pk', flat=True)
+        DevlogPost.tags.through.objects.bulk_create([
+            DevlogPost.tags.through(devlogpost_id=post_id, tag_id=tag.pk)
+            for post_id in post_ids.iterator()
+            for tag in self.random.sample(tags, 2)
+        ], batch_size=BATCH_SIZE)
+        return posts
+
+    def create_feed(self, projects, snapshots):
+        """Create the activity feed entries the save signals would have: projects, pushes and posts."""
+        pushed_at = {snapshot.repo_full_name: snapshot.pushed_at for snapshot in snapshots}
+        active = [project for project in projects if project.status == 'active']
+        entries = [project_entry(project) for project in active]
+        entries += [push_entry(project, pushed_at[project.repo_full_name]) for project in active]
+        posts = DevlogPost.objects.filter(
+            slug__startswith=SLUG_PREFIX,
+            status='published',
+            published_at__isnull=False,
+        )
+        entries += [post_entry(post) for post in posts.iterator()]
+        ActivityFeedEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+
+    def create_contributions(self, username, years):
+        start = date(self.today.year - years + 1, 1, 1)
+        days = []
+        day = start
+        while day <= self.today:
+            # Quieter weekends, with the occasional busy day
+            weight = 0.4 if day.weekday() >= 5 else 1.0
+            count = int(self.random.expovariate(1 / 4) * weight) if self.random.random() < 0.8 else 0
+            days.append(UserContributionDay(username=username, day=day, count=count))
+            day += timedelta(days=1)
+        UserContributionDay.objects.bulk_create(days, batch_size=BATCH_SIZE)
+        return len(days)
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_contentversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('slug', models.SlugField(max_length=60, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        # Lets the old column be re-added to existing rows if this is ever reversed
+        migrations.AlterField(
+            model_name='project',
+            name='stack',
+            field=models.CharField(blank=True, help_text='Comma-separated tech stack (e.g., Python, Django, PostgreSQL)', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='stack_tags',
+            field=models.ManyToManyField(blank=True, help_text='Tech stack (e.g., Python, Django, PostgreSQL)', related_name='projects', to='core.tag'),
+        ),
+    ]
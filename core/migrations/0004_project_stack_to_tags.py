@@ -0,0 +1,51 @@
+from django.db import migrations
+from django.utils.text import slugify
+
+# Kept separate from the schema changes around it: PostgreSQL can't ALTER a
+# table with pending deferred-constraint checks in the same transaction.
+
+
+def split_names(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def get_or_create_tag(Tag, name, cache):
+    """Return the tag named ``name`` (case-insensitively), creating it with a unique slug."""
+    key = name.lower()
+    if key not in cache:
+        tag = Tag.objects.filter(name__iexact=name).first()
+        if tag is None:
+            base = slugify(name) or 'tag'
+            slug, suffix = base, 2
+            while Tag.objects.filter(slug=slug).exists():
+                slug, suffix = f'{base}-{suffix}', suffix + 1
+            tag = Tag.objects.create(name=name[:50], slug=slug)
+        cache[key] = tag
+    return cache[key]
+
+
+def stack_to_tags(apps, schema_editor):
+    Tag = apps.get_model('core', 'Tag')
+    Project = apps.get_model('core', 'Project')
+    cache = {}
+    for project in Project.objects.all():
+        tags = [get_or_create_tag(Tag, name, cache) for name in split_names(project.stack)]
+        project.stack_tags.set(tags)
+
+
+def tags_to_stack(apps, schema_editor):
+    Project = apps.get_model('core', 'Project')
+    for project in Project.objects.prefetch_related('stack_tags'):
+        project.stack = ', '.join(tag.name for tag in project.stack_tags.all())
+        project.save(update_fields=['stack'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_tag'),
+    ]
+
+    operations = [
+        migrations.RunPython(stack_to_tags, tags_to_stack),
+    ]
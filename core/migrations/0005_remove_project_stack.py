@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_project_stack_to_tags'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='project',
+            name='stack',
+        ),
+        migrations.RenameField(
+            model_name='project',
+            old_name='stack_tags',
+            new_name='stack',
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devlog', '0006_remove_devlogpost_tags'),
+        ('core', '0005_remove_project_stack'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityFeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text="Identifies what the entry is about (e.g. devlog:42), so it's updated rather than duplicated", max_length=200, unique=True)),
+                ('kind', models.CharField(choices=[('project', 'Project'), ('devlog', 'Devlog'), ('push', 'Push'), ('stars', 'Stars')], max_length=20)),
+                ('title', models.CharField(max_length=200)),
+                ('url', models.CharField(max_length=300)),
+                ('description', models.CharField(blank=True, max_length=300)),
+                ('occurred_at', models.DateTimeField()),
+                ('post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='devlog.devlogpost')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='core.project')),
+            ],
+            options={
+                'verbose_name_plural': 'activity feed entries',
+                'ordering': ['-occurred_at', '-id'],
+                'indexes': [models.Index(fields=['-occurred_at', '-id'], name='feed_keyset_idx')],
+            },
+        ),
+    ]
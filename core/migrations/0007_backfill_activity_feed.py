@@ -0,0 +1,68 @@
+from django.db import migrations
+from django.urls import reverse
+
+BATCH_SIZE = 500
+
+
+def build_feed(apps, schema_editor):
+    ActivityFeedEntry = apps.get_model('core', 'ActivityFeedEntry')
+    Project = apps.get_model('core', 'Project')
+    DevlogPost = apps.get_model('devlog', 'DevlogPost')
+    RepoSnapshot = apps.get_model('githubsync', 'RepoSnapshot')
+
+    projects = list(Project.objects.filter(status='active'))
+    entries = [
+        ActivityFeedEntry(
+            key=f'project:{project.pk}',
+            kind='project',
+            title=project.title,
+            url=reverse('project_detail', kwargs={'slug': project.slug}),
+            description=project.tagline,
+            occurred_at=project.created_at,
+            project=project,
+        )
+        for project in projects
+    ]
+
+    # The latest push to each project's repo, as of the last sync
+    pushed_at = dict(
+        RepoSnapshot.objects.filter(pushed_at__isnull=False).values_list('repo_full_name', 'pushed_at')
+    )
+    entries += [
+        ActivityFeedEntry(
+            key=f'push:{project.pk}:{pushed_at[project.repo_full_name].date().isoformat()}',
+            kind='push',
+            title=project.title,
+            url=reverse('project_detail', kwargs={'slug': project.slug}),
+            description=f'Pushed to {project.repo_full_name}',
+            occurred_at=pushed_at[project.repo_full_name],
+            project=project,
+        )
+        for project in projects
+        if project.repo_full_name in pushed_at
+    ]
+
+    entries += [
+        ActivityFeedEntry(
+            key=f'devlog:{post.pk}',
+            kind='devlog',
+            title=post.title,
+            url=reverse('devlog_detail', kwargs={'slug': post.slug}),
+            occurred_at=post.published_at,
+            post=post,
+        )
+        for post in DevlogPost.objects.filter(status='published', published_at__isnull=False).iterator()
+    ]
+    ActivityFeedEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_activityfeedentry'),
+        ('githubsync', '0013_backfill_activity_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_feed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('githubsync', '0014_reposnapshot_sort_indexes'),
+        ('core', '0007_backfill_activity_feed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='repo_snapshot',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Synced GitHub data of repo_full_name, linked on save and by sync_github', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='projects', to='githubsync.reposnapshot'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def link_repo_snapshots(apps, schema_editor):
+    Project = apps.get_model('core', 'Project')
+    RepoSnapshot = apps.get_model('githubsync', 'RepoSnapshot')
+    Project.objects.update(repo_snapshot=Subquery(
+        RepoSnapshot.objects.filter(repo_full_name=OuterRef('repo_full_name')).values('pk')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_project_repo_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_repo_snapshots, migrations.RunPython.noop),
+    ]
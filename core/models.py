@@ -1,5 +1,37 @@
 from django.db import models
+from django.db.models import F
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.text import slugify
+
+
+class Tag(models.Model):
+    """A technology or topic shared by projects (as their stack) and devlog posts."""
+    name = models.CharField(max_length=50, unique=True)
+    slug = models.SlugField(max_length=60, unique=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    def get_absolute_url(self):
+        return reverse('tag_detail', kwargs={'slug': self.slug})
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = unique_tag_slug(Tag, self.name)
+        super().save(*args, **kwargs)
+
+
+def unique_tag_slug(tag_model, name):
+    """Return a slug for ``name`` not used by any ``tag_model`` row (e.g. 'c' and 'c-2' for C and C++)."""
+    base = slugify(name) or 'tag'
+    slug, suffix = base, 2
+    while tag_model.objects.filter(slug=slug).exists():
+        slug, suffix = f'{base}-{suffix}', suffix + 1
+    return slug
 
 
 class Project(models.Model):
@@ -16,14 +48,25 @@ class Project(models.Model):
         help_text="GitHub repo in format: owner/repo (e.g., bradshawrc93/project-name)"
     )
     tagline = models.CharField(max_length=300, help_text="Short description")
-    stack = models.CharField(
-        max_length=500,
-        help_text="Comma-separated tech stack (e.g., Python, Django, PostgreSQL)"
+    stack = models.ManyToManyField(
+        Tag,
+        blank=True,
+        related_name='projects',
+        help_text="Tech stack (e.g., Python, Django, PostgreSQL)"
     )
     demo_url = models.URLField(blank=True, null=True, help_text="Optional demo/live site URL")
     featured = models.BooleanField(default=False, help_text="Show on homepage")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
     sort_order = models.IntegerField(default=0, help_text="Lower numbers appear first")
+    repo_snapshot = models.ForeignKey(
+        'githubsync.RepoSnapshot',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        editable=False,
+        related_name='projects',
+        help_text="Synced GitHub data of repo_full_name, linked on save and by sync_github"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -36,7 +79,105 @@ class Project(models.Model):
     def get_absolute_url(self):
         return reverse('project_detail', kwargs={'slug': self.slug})
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'repo_full_name' in update_fields:
+            # The repo may have changed, or been synced before the project was added
+            snapshots = self._meta.get_field('repo_snapshot').related_model.objects
+            self.repo_snapshot_id = snapshots.filter(
+                repo_full_name=self.repo_full_name
+            ).values_list('pk', flat=True).first()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'repo_snapshot'}
+        super().save(*args, **kwargs)
+
     def get_stack_list(self):
-        """Return stack as a list of strings."""
-        return [s.strip() for s in self.stack.split(',') if s.strip()]
+        """Return the stack's tags (uses prefetch_related('stack') when available)."""
+        return list(self.stack.all())
+
+
+class ContentVersion(models.Model):
+    """
+    Version counter for a scope of cached content (e.g. 'contributions').
+
+    Caches key their entries on the current version, and writers bump it when
+    the underlying data changes, so every process sees the invalidation.
+    """
+    PROJECTS = 'projects'
+    DEVLOG = 'devlog'
+    CONTRIBUTIONS = 'contributions'
+    GITHUB = 'github'
+    FEED = 'feed'
+
+    scope = models.CharField(max_length=50, unique=True)
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.scope} v{self.version}"
+
+    @classmethod
+    def current(cls, scope):
+        """Return the current version of ``scope`` (0 if it was never bumped)."""
+        return cls.objects.filter(scope=scope).values_list('version', flat=True).first() or 0
+
+    @classmethod
+    def bump(cls, *scopes):
+        """Increment the version of each scope, invalidating content cached under it."""
+        for scope in scopes:
+            updated = cls.objects.filter(scope=scope).update(version=F('version') + 1, updated_at=timezone.now())
+            if not updated:
+                cls.objects.get_or_create(scope=scope, defaults={'version': 1})
 
+
+class ActivityFeedEntry(models.Model):
+    """
+    One item of the activity feed (see core.feed), stored when the thing it
+    describes changes so the feed is read newest first with one indexed query.
+    """
+    PROJECT = 'project'
+    DEVLOG = 'devlog'
+    PUSH = 'push'
+    STARS = 'stars'
+    KIND_CHOICES = [
+        (PROJECT, 'Project'),
+        (DEVLOG, 'Devlog'),
+        (PUSH, 'Push'),
+        (STARS, 'Stars'),
+    ]
+
+    key = models.CharField(
+        max_length=200,
+        unique=True,
+        help_text="Identifies what the entry is about (e.g. devlog:42), so it's updated rather than duplicated"
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    title = models.CharField(max_length=200)
+    url = models.CharField(max_length=300)
+    description = models.CharField(max_length=300, blank=True)
+    occurred_at = models.DateTimeField()
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name='feed_entries'
+    )
+    post = models.ForeignKey(
+        'devlog.DevlogPost',
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name='feed_entries'
+    )
+
+    class Meta:
+        verbose_name_plural = 'activity feed entries'
+        ordering = ['-occurred_at', '-id']
+        indexes = [
+            # Serves the homepage's latest entries and the keyset-paginated feed
+            models.Index(fields=['-occurred_at', '-id'], name='feed_keyset_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_kind_display()}: {self.title}'
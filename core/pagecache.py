@@ -0,0 +1,77 @@
+"""
+Full-page cache for the public views.
+
+A page is cached under its content key (see ``core.versioning``): its path and
+the query parameters the views read, today's date, the release and the current
+versions of the content scopes it's built from. Model signals and sync_github
+bump the scope versions, which makes every page that depends on them miss; the
+entries left behind by old versions expire after ``PAGE_CACHE_TIMEOUT``.
+
+Hits and misses are counted per view in the cache and exposed by the
+``page_cache_stats`` view.
+"""
+
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from core.versioning import get_content_state
+
+KEY_PREFIX = 'page'
+
+cached_views = []
+
+
+def count(view_name, outcome):
+    key = f'{KEY_PREFIX}:{outcome}:{view_name}'
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # The counter was evicted between add() and incr()
+            cache.add(key, 1, None)
+
+
+def get_stats():
+    """Return ``{view_name: {'hits': n, 'misses': n}}`` for every cached view."""
+    keys = [f'{KEY_PREFIX}:{outcome}:{name}' for name in cached_views for outcome in ('hit', 'miss')]
+    values = cache.get_many(keys)
+    return {
+        name: {
+            'hits': values.get(f'{KEY_PREFIX}:hit:{name}', 0),
+            'misses': values.get(f'{KEY_PREFIX}:miss:{name}', 0),
+        }
+        for name in cached_views
+    }
+
+
+def cache_page(*scopes):
+    """Cache a view's GET responses until one of ``scopes`` is bumped."""
+    def decorator(view):
+        view_name = view.__name__
+        cached_views.append(view_name)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not settings.PAGE_CACHE_ENABLED or request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            key = f'{KEY_PREFIX}:{get_content_state(request, scopes).key}'
+            cached = cache.get(key)
+            if cached is not None:
+                count(view_name, 'hit')
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response['X-Page-Cache'] = 'HIT'
+                return response
+
+            count(view_name, 'miss')
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                cache.set(key, (response.content, response['Content-Type']), settings.PAGE_CACHE_TIMEOUT)
+                response['X-Page-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,136 @@
+"""
+Keyset (cursor) pagination for newest-first lists.
+
+Pages are selected with a WHERE on the ``(timestamp, id)`` ordering key
+instead of an OFFSET, and one extra row is fetched to tell whether another
+page follows. No COUNT(*) is run, and with a matching composite index every
+page costs the same however many rows precede it. Cursors identify a row
+rather than a position, so links stay stable as new rows are added.
+
+Static hosts ignore query strings, so under ``export_static`` lists are paged
+by number instead (``?page=N``), each page exported to ``<list>/page/N/``
+and linked there; a page past the end is a 404, which ends the export's walk.
+"""
+
+import base64
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import Http404
+
+# Primary keys are at most a signed 64-bit integer (BigAutoField)
+MAX_PK = 2 ** 63 - 1
+
+
+@dataclass
+class KeysetPage:
+    items: list
+    next_url: str = None
+    previous_url: str = None
+
+    @property
+    def has_next(self):
+        return self.next_url is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_url is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+def export_page_path(path, number):
+    """Return the path page ``number`` of the list at ``path`` is exported to."""
+    return path if number == 1 else f'{path}page/{number}/'
+
+
+def encode_cursor(timestamp, pk):
+    return base64.urlsafe_b64encode(f'{timestamp.isoformat()}|{pk}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return ``(timestamp, pk)`` for a cursor, or None if it's malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        timestamp, pk = raw.split('|')
+        # Normalised to UTC here, as the database would be, so a timestamp at
+        # the edge of the calendar fails as a malformed cursor rather than in the query
+        timestamp, pk = datetime.fromisoformat(timestamp).astimezone(timezone.utc), int(pk)
+    except (ValueError, OverflowError, UnicodeDecodeError):
+        return None
+    # The database can't compare against a pk it couldn't store
+    if not -MAX_PK - 1 <= pk <= MAX_PK:
+        return None
+    return timestamp, pk
+
+
+def paginate_keyset(queryset, request, field, per_page):
+    """
+    Return the ``KeysetPage`` of ``queryset`` requested by ``request``.
+
+    Rows are ordered newest first by the DateTimeField ``field`` and then by
+    primary key. ``?before=<cursor>`` selects the page following a row and
+    ``?after=<cursor>`` the page preceding it; a missing or malformed cursor
+    selects the first page.
+    """
+    if settings.STATIC_EXPORT:
+        return paginate_export(queryset, request, field, per_page)
+
+    before = decode_cursor(request.GET.get('before', ''))
+    after = decode_cursor(request.GET.get('after', '')) if before is None else None
+
+    if after is not None:
+        timestamp, pk = after
+        rows = list(
+            queryset.filter(Q(**{f'{field}__gt': timestamp}) | Q(**{field: timestamp, 'pk__gt': pk}))
+            .order_by(field, 'pk')[:per_page + 1]
+        )
+        more_newer = len(rows) > per_page
+        items = rows[:per_page][::-1]
+        more_older = True
+    else:
+        if before is not None:
+            timestamp, pk = before
+            queryset = queryset.filter(Q(**{f'{field}__lt': timestamp}) | Q(**{field: timestamp, 'pk__lt': pk}))
+        rows = list(queryset.order_by(f'-{field}', '-pk')[:per_page + 1])
+        more_older = len(rows) > per_page
+        items = rows[:per_page]
+        more_newer = before is not None
+
+    page = KeysetPage(items)
+    if items and more_older:
+        page.next_url = f'?before={encode_cursor(getattr(items[-1], field), items[-1].pk)}'
+    if items and more_newer:
+        page.previous_url = f'?after={encode_cursor(getattr(items[0], field), items[0].pk)}'
+    return page
+
+
+def page_number(request):
+    """Return the ``?page=`` number of an exported list page; 404 if it isn't a page number."""
+    try:
+        number = int(request.GET.get('page', 1))
+    except ValueError:
+        raise Http404('Invalid page number')
+    if number < 1:
+        raise Http404('Invalid page number')
+    return number
+
+
+def paginate_export(queryset, request, field, per_page):
+    """Return the numbered page of ``queryset`` requested by ``export_static``, linked by export path."""
+    number = page_number(request)
+    offset = (number - 1) * per_page
+    rows = list(queryset.order_by(f'-{field}', '-pk')[offset:offset + per_page + 1])
+    if number > 1 and not rows:
+        raise Http404('No such page')
+
+    page = KeysetPage(rows[:per_page])
+    if len(rows) > per_page:
+        page.next_url = export_page_path(request.path, number + 1)
+    if number > 1:
+        page.previous_url = export_page_path(request.path, number - 1)
+    return page
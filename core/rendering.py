@@ -0,0 +1,30 @@
+"""
+Markdown rendering shared by project READMEs and devlog posts.
+
+Rendered HTML is stored next to its source together with a hash of the source
+text and the renderer configuration (extension list plus the installed
+Markdown and Pygments versions), so pages can serve it directly and it's only
+re-rendered when one of those inputs changes.
+"""
+
+import hashlib
+
+import markdown
+import pygments
+
+from core.timing import MARKDOWN, timed
+
+README_EXTENSIONS = ['fenced_code', 'codehilite', 'tables', 'toc']
+DEVLOG_EXTENSIONS = ['fenced_code', 'tables', 'codehilite']
+
+
+def render_markdown(text, extensions):
+    """Render Markdown source to HTML."""
+    with timed(MARKDOWN):
+        return markdown.markdown(text, extensions=extensions)
+
+
+def render_hash(text, extensions):
+    """Return a hash identifying ``text`` rendered with the current renderer config."""
+    config = '|'.join([markdown.__version__, pygments.__version__, *extensions])
+    return hashlib.sha256(f'{config}\n{text}'.encode('utf-8')).hexdigest()
@@ -0,0 +1,27 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from .feed import update_project_entries
+from .models import ContentVersion, Project, Tag
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_pages(sender, **kwargs):
+    ContentVersion.bump(ContentVersion.PROJECTS)
+
+
+@receiver(post_save, sender=Project)
+def update_project_feed(sender, instance, **kwargs):
+    update_project_entries(instance)
+
+
+@receiver(m2m_changed, sender=Project.stack.through)
+def invalidate_project_stack_pages(sender, action, **kwargs):
+    if action.startswith('post_'):
+        ContentVersion.bump(ContentVersion.PROJECTS)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tagged_pages(sender, **kwargs):
+    ContentVersion.bump(ContentVersion.PROJECTS, ContentVersion.DEVLOG)
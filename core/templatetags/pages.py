@@ -0,0 +1,32 @@
+from urllib.parse import urlencode
+
+from django import template
+from django.conf import settings
+
+from core.pagination import export_page_path
+from core.versioning import PAGE_PARAMS
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def page_query(context, **params):
+    """
+    Return the query string of a link to the current page with ``params`` set.
+
+    The page's other ``PAGE_PARAMS`` are kept, so picking a year keeps the
+    sort and vice versa; a None value drops a parameter. Anything else in the
+    query is left out, as cached pages aren't keyed on it.
+    """
+    current = context['request'].GET
+    query = [(name, value) for name in PAGE_PARAMS if name not in params for value in current.getlist(name)]
+    query += [(name, value) for name, value in params.items() if value is not None]
+    return f'?{urlencode(query)}'
+
+
+@register.simple_tag(takes_context=True)
+def page_link(context, number):
+    """Return the link to page ``number`` of a numbered list: ``?page=`` live, its own path in the static export."""
+    if settings.STATIC_EXPORT:
+        return export_page_path(context['request'].path, number)
+    return page_query(context, page=number)
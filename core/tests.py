@@ -0,0 +1,84 @@
+import base64
+from datetime import datetime, timedelta, timezone
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.models import Tag
+from core.pagination import decode_cursor, encode_cursor
+from devlog.models import DevlogPost
+from devlog.views import POSTS_PER_PAGE
+
+
+def raw_cursor(raw):
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+# Cursors that decode but can't be used in a query: the pk overflows a 64-bit
+# integer, or the timestamp overflows the calendar when converted to UTC
+UNUSABLE_CURSORS = [
+    raw_cursor('2025-01-01T00:00:00+00:00|99999999999999999999999'),
+    raw_cursor('2025-01-01T00:00:00+00:00|-9223372036854775809'),
+    raw_cursor('9999-12-31T23:59:59-12:00|1'),
+    raw_cursor('0001-01-01T00:00:00+05:00|1'),
+]
+
+
+class DecodeCursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        timestamp = datetime(2025, 3, 1, 12, 30, tzinfo=timezone.utc)
+        self.assertEqual(decode_cursor(encode_cursor(timestamp, 42)), (timestamp, 42))
+
+    def test_malformed_cursors(self):
+        for cursor in ['', 'not a cursor', raw_cursor('2025-01-01|x'), raw_cursor('no separator')]:
+            with self.subTest(cursor=cursor):
+                self.assertIsNone(decode_cursor(cursor))
+
+    def test_unusable_cursors(self):
+        for cursor in UNUSABLE_CURSORS:
+            with self.subTest(cursor=cursor):
+                self.assertIsNone(decode_cursor(cursor))
+
+
+# Pages are rendered without running collectstatic first
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class PaginatedViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tag = Tag.objects.create(name='Django')
+
+    def test_unusable_cursors_show_the_first_page(self):
+        for path in ['/devlog/', '/activity/', self.tag.get_absolute_url()]:
+            for param in ['before', 'after']:
+                for cursor in UNUSABLE_CURSORS:
+                    with self.subTest(path=path, param=param, cursor=cursor):
+                        response = self.client.get(f'{path}?{param}={cursor}', secure=True)
+                        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage', STATIC_EXPORT=True)
+class ExportPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        published_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for index in range(POSTS_PER_PAGE + 1):
+            DevlogPost.objects.create(
+                title=f'Post {index}',
+                slug=f'post-{index}',
+                content_md='Text',
+                status='published',
+                published_at=published_at + timedelta(days=index),
+            )
+
+    def test_pages_link_to_their_export_paths(self):
+        first = self.client.get('/devlog/', secure=True)
+        self.assertContains(first, 'href="/devlog/page/2/"')
+        self.assertNotContains(first, '?before=')
+
+        second = self.client.get('/devlog/?page=2', secure=True)
+        self.assertContains(second, 'href="/devlog/"')
+        self.assertContains(second, 'href="/devlog/post-0/"')
+
+    def test_page_past_the_end_is_missing(self):
+        for query in ['?page=3', '?page=0', '?page=x']:
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/devlog/{query}', secure=True).status_code, 404)
@@ -0,0 +1,102 @@
+"""
+Per-request timing of SQL, template rendering and Markdown rendering.
+
+``ServerTimingMiddleware`` (see ``core.middleware``) puts a ``RequestTimings``
+collector in a context variable for the duration of each request. Code that
+does measurable work wraps it in ``timed(category)``, which is a no-op when no
+request is being timed (management commands, worker processes).
+
+Times are exclusive: a lazy queryset evaluated while a template renders
+counts as SQL time, not template time, so the categories add up to at most
+the request's total.
+"""
+
+import heapq
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.template.backends.django import DjangoTemplates
+
+DB = 'db'
+TEMPLATE = 'tpl'
+MARKDOWN = 'md'
+
+TOP_QUERIES = 5
+
+current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.totals = dict.fromkeys((DB, TEMPLATE, MARKDOWN), 0.0)
+        self.queries = 0
+        self.slowest_queries = []  # Min-heap of (seconds, sql), at most TOP_QUERIES long
+        self._children = []  # Time spent in nested timers, per open timer
+
+    def start(self):
+        self._children.append(0.0)
+        return perf_counter()
+
+    def stop(self, category, started):
+        elapsed = perf_counter() - started
+        self.totals[category] += elapsed - self._children.pop()
+        if self._children:
+            self._children[-1] += elapsed
+        return elapsed
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook timing each query."""
+        started = self.start()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = self.stop(DB, started)
+            self.queries += 1
+            entry = (elapsed, sql)
+            if len(self.slowest_queries) < TOP_QUERIES:
+                heapq.heappush(self.slowest_queries, entry)
+            elif entry > self.slowest_queries[0]:
+                heapq.heapreplace(self.slowest_queries, entry)
+
+    def top_queries(self):
+        """Return ``[(seconds, sql)]`` for the slowest queries, slowest first."""
+        return sorted(self.slowest_queries, reverse=True)
+
+
+@contextmanager
+def timed(category):
+    """Add the time spent in the block to ``category`` of the current request, if any."""
+    timings = current.get()
+    if timings is None:
+        yield
+        return
+    started = timings.start()
+    try:
+        yield
+    finally:
+        timings.stop(category, started)
+
+
+class TimedTemplate:
+    """Backend template wrapper that times ``render()``."""
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        with timed(TEMPLATE):
+            return self.template.render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with render time recorded per request."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
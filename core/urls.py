@@ -3,7 +3,11 @@ from . import views
 
 urlpatterns = [
     path('', views.home, name='home'),
+    path('activity/', views.activity, name='activity'),
     path('projects/', views.project_list, name='project_list'),
     path('projects/<slug:slug>/', views.project_detail, name='project_detail'),
+    path('tags/', views.tag_list, name='tag_list'),
+    path('tags/<slug:slug>/', views.tag_detail, name='tag_detail'),
+    path('page-cache/stats/', views.page_cache_stats, name='page_cache_stats'),
 ]
 
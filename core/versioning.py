@@ -0,0 +1,61 @@
+"""
+Content versions of the public pages.
+
+A page's content is fully determined by its path, the query parameters the
+views read (``PAGE_PARAMS``; anything else, like tracking tags, is ignored),
+today's date (charts and the heatmap are relative to it), the deployed
+release and the ``ContentVersion`` of each scope it's built from. That state
+costs a single small query and is memoized on the request, so the page cache
+and conditional GET handling can both use it.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import ContentVersion
+
+# Query parameters that change what a public page shows
+PAGE_PARAMS = ('after', 'before', 'page', 'q', 'range', 'sort', 'year')
+
+
+def page_url(request):
+    """Return the request path with only the ``PAGE_PARAMS`` of its query, sorted."""
+    query = urlencode([(name, value) for name in PAGE_PARAMS for value in request.GET.getlist(name)])
+    return f'{request.path}?{query}' if query else request.path
+
+
+@dataclass
+class ContentState:
+    versions: dict
+    last_modified: datetime
+    key: str
+
+
+def get_content_state(request, scopes):
+    """Return the ``ContentState`` of the page requested, built from ``scopes``."""
+    memo = request.__dict__.setdefault('_content_states', {})
+    if scopes in memo:
+        return memo[scopes]
+
+    today = timezone.localdate()
+    versions = dict.fromkeys(scopes, 0)
+    last_modified = timezone.make_aware(datetime.combine(today, time.min))
+    for scope, version, updated_at in ContentVersion.objects.filter(scope__in=scopes).values_list(
+        'scope', 'version', 'updated_at'
+    ):
+        versions[scope] = version
+        last_modified = max(last_modified, updated_at)
+
+    parts = [page_url(request), today.isoformat(), settings.RELEASE]
+    if settings.STATIC_EXPORT:
+        parts.append('export')
+    parts += [f'{scope}={version}' for scope, version in sorted(versions.items())]
+    key = hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+    memo[scopes] = state = ContentState(versions, last_modified, key)
+    return state
@@ -1,155 +1,134 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.paginator import InvalidPage, Paginator
+from django.http import Http404, JsonResponse
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.shortcuts import render, get_object_or_404
 from django.utils import timezone
-from markdown import markdown
-from .models import Project
+from .conditional import conditional_page
+from .feed import latest_entries
+from .models import ActivityFeedEntry, ContentVersion, Project, Tag
+from .pagecache import cache_page, get_stats
+from .pagination import page_number, paginate_keyset
 from devlog.models import DevlogPost
-from githubsync.models import RepoSnapshot, RepoActivityPoint, UserContributionDay
-from datetime import date, timedelta
+from githubsync.heatmap import heatmap_context
+from githubsync.sparkline import RANGE_90_DAYS, RANGE_ALL, RANGES, axis_labels, render_range
 
+HOME_SCOPES = (ContentVersion.PROJECTS, ContentVersion.DEVLOG, ContentVersion.CONTRIBUTIONS, ContentVersion.FEED)
+ACTIVITY_SCOPES = (ContentVersion.PROJECTS, ContentVersion.DEVLOG, ContentVersion.FEED)
+PROJECT_LIST_SCOPES = (ContentVersion.PROJECTS, ContentVersion.CONTRIBUTIONS, ContentVersion.GITHUB)
+PROJECT_DETAIL_SCOPES = (ContentVersion.PROJECTS, ContentVersion.DEVLOG, ContentVersion.GITHUB)
+TAG_SCOPES = (ContentVersion.PROJECTS, ContentVersion.DEVLOG)
+FEED_ON_HOME = 10
+# ?sort= options of the project list: (label, ordering); the repo stats orderings use RepoSnapshot's indexes
+PROJECT_SORTS = {
+    'featured': ('Featured', ('sort_order', 'title')),
+    'activity': ('Most active', (F('commits_90d').desc(nulls_last=True), 'sort_order', 'title')),
+    'stars': ('Most stars', (F('stars').desc(nulls_last=True), 'sort_order', 'title')),
+    'pushed': ('Recently pushed', (F('pushed_at').desc(nulls_last=True), 'sort_order', 'title')),
+}
+DEFAULT_PROJECT_SORT = 'featured'
+ENTRIES_PER_PAGE = 30
+PROJECTS_PER_PAGE = 24
+TAG_POSTS_PER_PAGE = 20
 
+
+@conditional_page(*HOME_SCOPES)
+@cache_page(*HOME_SCOPES)
 def home(request):
     """Homepage with profile, heatmap, summary, activity feed, and projects."""
-    featured_projects = Project.objects.filter(featured=True, status='active')[:6]
-    
-    # Get latest devlog posts
-    latest_devlog = DevlogPost.objects.filter(
-        status='published',
-        published_at__isnull=False
-    ).order_by('-published_at')[:10]
-    
-    # Combine into activity feed (devlog posts + projects)
-    latest_activity = []
-    
-    # Add latest projects
-    latest_projects = Project.objects.filter(status='active').order_by('-created_at')[:5]
-    for project in latest_projects:
-        latest_activity.append({
-            'type': 'Project',
-            'title': project.title,
-            'url': project.get_absolute_url(),
-            'date': project.created_at.strftime('%b %d, %Y'),
-            'description': project.tagline,
-        })
-    
-    # Add latest devlog posts
-    for post in latest_devlog:
-        latest_activity.append({
-            'type': 'Devlog',
-            'title': post.title,
-            'url': post.get_absolute_url(),
-            'date': post.published_at.strftime('%b %d, %Y') if post.published_at else '',
-        })
-    
-    # Sort by date (most recent first) and limit to 10 items
-    latest_activity.sort(key=lambda x: x['date'], reverse=True)
-    latest_activity = latest_activity[:10]
-    
-    # Get heatmap data
-    username = 'bradshawrc93'
-    year = timezone.now().year
-    year_start = date(year, 1, 1)
-    year_end = date(year, 12, 31)
-    
-    contribution_days = UserContributionDay.objects.filter(
-        username=username,
-        day__gte=year_start,
-        day__lte=year_end
-    ).order_by('day')
+    featured_projects = Project.objects.filter(featured=True, status='active').prefetch_related('stack')[:6]
     
-    heatmap_dict = {contrib.day: contrib.count for contrib in contribution_days}
-    heatmap_data = []
-    contribution_counts = [c.count for c in contribution_days] if contribution_days else [0]
-    max_count = max(contribution_counts) if contribution_counts else 1
+    # Latest activity (projects, devlog posts, pushes, star milestones), kept up to date as they change
+    latest_activity = latest_entries(FEED_ON_HOME)
     
+    # Heatmap grid HTML (cached until the next sync writes contribution days), any stored year via ?year=
     today = timezone.now().date()
-    current_date = year_start
-    while current_date <= year_end:
-        count = heatmap_dict.get(current_date, 0)
-        is_future = current_date > today
-        heatmap_data.append((current_date, count, is_future))
-        current_date += timedelta(days=1)
     
     context = {
         'featured_projects': featured_projects,
         'latest_activity': latest_activity,
-        'heatmap_data': heatmap_data,
-        'year': year,
-        'max_count': max_count,
-        'has_heatmap_data': len(heatmap_data) > 0,
+        **heatmap_context(settings.GITHUB_USERNAME, request.GET.get('year'), today),
     }
     return render(request, 'core/home.html', context)
 
 
-def project_list(request):
-    """Projects list page with contribution heatmap."""
-    projects = Project.objects.filter(status='active').order_by('sort_order', 'title')
-    
-    # Get contribution heatmap data for current year
-    username = 'bradshawrc93'
-    year = timezone.now().year
-    year_start = date(year, 1, 1)
-    year_end = date(year, 12, 31)
-    
-    contribution_days = UserContributionDay.objects.filter(
-        username=username,
-        day__gte=year_start,
-        day__lte=year_end
-    ).order_by('day')
-    
-    # Build heatmap data structure as a list of (day, count) tuples
-    # Include all days in the year for proper grid display
-    heatmap_dict = {contrib.day: contrib.count for contrib in contribution_days}
-    heatmap_data = []
-    contribution_counts = [c.count for c in contribution_days] if contribution_days else [0]
-    max_count = max(contribution_counts) if contribution_counts else 1
+@conditional_page(*ACTIVITY_SCOPES)
+@cache_page(*ACTIVITY_SCOPES)
+def activity(request):
+    """The whole activity feed, newest first, paginated by (occurred_at, id)."""
+    page = paginate_keyset(ActivityFeedEntry.objects.all(), request, 'occurred_at', ENTRIES_PER_PAGE)
     
+    context = {
+        'entries': page.items,
+        'page': page,
+    }
+    return render(request, 'core/activity.html', context)
+
+
+@conditional_page(*PROJECT_LIST_SCOPES)
+@cache_page(*PROJECT_LIST_SCOPES)
+def project_list(request):
+    """Projects list page with contribution heatmap and each project's repo stats and activity sparkline."""
+    sort = request.GET.get('sort')
+    if sort not in PROJECT_SORTS:
+        sort = DEFAULT_PROJECT_SORT
+    
+    # Repo stats come from the linked snapshot in the same query; its README columns are left out.
+    # Sorts aren't by a timestamp, so pages are numbered (?page=) rather than keyset cursors.
+    projects = Project.objects.filter(status='active').annotate(
+        stars=F('repo_snapshot__stars'),
+        language=F('repo_snapshot__language'),
+        pushed_at=F('repo_snapshot__pushed_at'),
+        commits_90d=F('repo_snapshot__activity_total'),
+        activity_svg=F('repo_snapshot__activity_svg'),
+    ).order_by(*PROJECT_SORTS[sort][1], 'pk').prefetch_related('stack')
+    paginator = Paginator(projects, PROJECTS_PER_PAGE)
+    if settings.STATIC_EXPORT:
+        # The export walks the pages until one is missing (see core.pagination)
+        try:
+            page = paginator.page(page_number(request))
+        except InvalidPage:
+            raise Http404('No such page')
+    else:
+        page = paginator.get_page(request.GET.get('page'))
+    projects = list(page.object_list)
+    for project in projects:
+        # Formatted here: the template's date filter costs about as much as the rest of a card
+        project.pushed_on = timezone.localtime(project.pushed_at).strftime('%b %d, %Y') if project.pushed_at else ''
+    
+    # Contribution heatmap for the current year or the one picked with ?year=, every day of it for the grid
     today = timezone.now().date()
-    current_date = year_start
-    while current_date <= year_end:
-        count = heatmap_dict.get(current_date, 0)
-        is_future = current_date > today
-        heatmap_data.append((current_date, count, is_future))
-        current_date += timedelta(days=1)
     
     context = {
         'projects': projects,
-        'heatmap_data': heatmap_data,
-        'year': year,
-        'max_count': max_count,
-        'has_heatmap_data': len(heatmap_data) > 0,
+        'page': page,
+        'sort': sort,
+        'sorts': [(option, label) for option, (label, _) in PROJECT_SORTS.items()],
+        **heatmap_context(settings.GITHUB_USERNAME, request.GET.get('year'), today),
     }
     return render(request, 'core/project_list.html', context)
 
 
+@conditional_page(*PROJECT_DETAIL_SCOPES)
+@cache_page(*PROJECT_DETAIL_SCOPES)
 def project_detail(request, slug):
     """Project detail page with repo activity chart and related devlog posts."""
-    project = get_object_or_404(Project, slug=slug, status='active')
-    
-    # Get repo snapshot
-    try:
-        snapshot = RepoSnapshot.objects.get(repo_full_name=project.repo_full_name)
-    except RepoSnapshot.DoesNotExist:
-        snapshot = None
-    
-    # Get last 90 days of activity
-    today = timezone.now().date()
-    cutoff_date = today - timedelta(days=90)
-    
-    activity_points = RepoActivityPoint.objects.filter(
-        repo_full_name=project.repo_full_name,
-        day__gte=cutoff_date,
-        day__lte=today
-    ).order_by('day')
-    
-    # Build activity data
-    activity_data = []
-    max_commits = 1
-    for point in activity_points:
-        activity_data.append({
-            'day': point.day,
-            'commits': point.commits,
-        })
-        max_commits = max(max_commits, point.commits)
+    project = get_object_or_404(Project.objects.select_related('repo_snapshot'), slug=slug, status='active')
+    snapshot = project.repo_snapshot
+    
+    # The 90-day activity sparkline is rendered at sync time; only its date labels are built here.
+    # Longer ranges (?range=1y|all) are drawn from the weekly/monthly rollups.
+    activity_range = request.GET.get('range')
+    if activity_range not in RANGES:
+        activity_range = RANGE_90_DAYS
+    if activity_range == RANGE_90_DAYS:
+        activity_svg = snapshot.activity_svg if snapshot else ''
+        activity_axis = axis_labels(snapshot.activity_end) if activity_svg and snapshot.activity_end else []
+    else:
+        end = snapshot.activity_end if snapshot and snapshot.activity_end else timezone.now().date()
+        activity_svg, activity_axis = render_range(project.repo_full_name, activity_range, end)
     
     # Get related devlog posts
     related_posts = DevlogPost.objects.filter(
@@ -158,22 +137,70 @@ def project_detail(request, slug):
         published_at__isnull=False
     )[:5]
     
-    # Render README as HTML if it exists
-    readme_html = ''
-    if snapshot and snapshot.readme_content:
-        readme_html = markdown(
-            snapshot.readme_content,
-            extensions=['fenced_code', 'codehilite', 'tables', 'toc']
-        )
+    # README HTML is rendered at sync time; stale snapshots re-render lazily
+    readme_html = snapshot.get_readme_html() if snapshot else ''
     
     context = {
         'project': project,
         'snapshot': snapshot,
-        'activity_data': activity_data,
-        'max_commits': max_commits,
-        'has_activity_data': len(activity_data) > 0,
+        'activity_svg': activity_svg,
+        'activity_axis': activity_axis,
+        'activity_range': activity_range,
+        'activity_range_label': RANGES[activity_range],
+        'activity_ranges': RANGES.items(),
+        'activity_date_format': 'M Y' if activity_range == RANGE_ALL else 'M d',
         'related_posts': related_posts,
         'readme_html': readme_html,
     }
     return render(request, 'core/project_detail.html', context)
 
+
+def tag_count(links):
+    """Count of ``links`` (rows of a tag M2M table) per tag, correlated to the outer tag."""
+    counts = links.filter(tag=OuterRef('pk')).order_by().values('tag').annotate(count=Count('*')).values('count')
+    return Coalesce(Subquery(counts), 0)
+
+
+@conditional_page(*TAG_SCOPES)
+@cache_page(*TAG_SCOPES)
+def tag_list(request):
+    """All tags in use, with how many projects and devlog posts carry each."""
+    # Each count is a separate subquery on its M2M table: counting both
+    # relations in one join would multiply every tag's projects by its posts
+    tags = Tag.objects.annotate(
+        project_count=tag_count(Project.stack.through.objects.filter(project__status='active')),
+        post_count=tag_count(DevlogPost.tags.through.objects.filter(
+            devlogpost__status='published',
+            devlogpost__published_at__isnull=False
+        )),
+    ).filter(Q(project_count__gt=0) | Q(post_count__gt=0))
+    
+    return render(request, 'core/tag_list.html', {'tags': tags})
+
+
+@conditional_page(*TAG_SCOPES)
+@cache_page(*TAG_SCOPES)
+def tag_detail(request, slug):
+    """Projects using a tag in their stack and devlog posts tagged with it, paginated like the devlog."""
+    tag = get_object_or_404(Tag, slug=slug)
+    
+    projects = tag.projects.filter(status='active').order_by('sort_order', 'title').prefetch_related('stack')
+    posts = tag.devlog_posts.filter(
+        status='published',
+        published_at__isnull=False
+    ).defer('content_md', 'content_html').select_related('project').prefetch_related('tags')
+    page = paginate_keyset(posts, request, 'published_at', TAG_POSTS_PER_PAGE)
+    
+    context = {
+        'tag': tag,
+        'projects': projects,
+        'posts': page.items,
+        'page': page,
+    }
+    return render(request, 'core/tag_detail.html', context)
+
+
+@staff_member_required
+def page_cache_stats(request):
+    """Page cache hit/miss counters per view, as JSON."""
+    return JsonResponse(get_stats())
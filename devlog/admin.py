@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
+from search import index
 from .models import DevlogPost
 
 
@@ -7,8 +8,11 @@ from .models import DevlogPost
 class DevlogPostAdmin(admin.ModelAdmin):
     list_display = ('title', 'slug', 'status', 'published_at', 'project', 'created_at', 'preview_link')
     list_filter = ('status', 'published_at', 'created_at', 'project')
-    search_fields = ('title', 'content_md', 'tags')
+    # Only shows the search box: get_search_results queries the full-text index instead
+    search_fields = ('title',)
+    search_help_text = 'Full-text search over title, content and tags'
     prepopulated_fields = {'slug': ('title',)}
+    autocomplete_fields = ('tags',)
     list_editable = ('status',)
     date_hierarchy = 'published_at'
     ordering = ('-published_at', '-created_at')
@@ -37,10 +41,18 @@ class DevlogPostAdmin(admin.ModelAdmin):
         return '-'
     preview_link.short_description = 'Preview'
     
+    def get_search_results(self, request, queryset, search_term):
+        # Use the full-text index instead of LIKE '%...%' scans over search_fields
+        if not search_term.strip():
+            return super().get_search_results(request, queryset, search_term)
+        documents = index.matching_documents(search_term, index.DEVLOG, public_only=False)
+        return queryset.filter(pk__in=documents.values('object_id')), False
+
     def save_model(self, request, obj, form, change):
         # Auto-set published_at if status is published and it's not set
         if obj.status == 'published' and not obj.published_at:
             from django.utils import timezone
             obj.published_at = timezone.now()
+        obj.refresh_content_html()
         super().save_model(request, obj, form, change)
 
@@ -5,3 +5,5 @@ class DevlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'devlog'
 
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,79 @@
+"""
+Management command to re-render stored devlog HTML.
+
+Only posts whose content or renderer config changed since they were last
+rendered are re-rendered, unless --force is given. Rendering is CPU-bound, so
+it's spread across a process pool; results are written back with bulk_update,
+which skips signals, so the devlog content version is bumped here instead.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import os
+from django.core.management.base import BaseCommand
+from core.models import ContentVersion
+from core.rendering import DEVLOG_EXTENSIONS, render_hash, render_markdown
+from devlog.models import DevlogPost
+
+CHUNK_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Re-render stored HTML for devlog posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of rendering processes (default: CPU count)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render every post, even if its stored HTML is current',
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        force = options['force']
+        render = partial(render_markdown, extensions=DEVLOG_EXTENSIONS)
+
+        posts = DevlogPost.objects.only('id', 'content_md', 'content_hash').order_by('id')
+        total = rendered = 0
+
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            chunk = []
+            for post in posts.iterator(chunk_size=CHUNK_SIZE):
+                total += 1
+                content_hash = render_hash(post.content_md, DEVLOG_EXTENSIONS)
+                if force or content_hash != post.content_hash:
+                    post.content_hash = content_hash
+                    chunk.append(post)
+                if len(chunk) >= CHUNK_SIZE:
+                    rendered += self.render_chunk(chunk, render, executor, workers)
+                    chunk = []
+            if chunk:
+                rendered += self.render_chunk(chunk, render, executor, workers)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if rendered:
+            ContentVersion.bump(ContentVersion.DEVLOG)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Re-rendered {rendered} of {total} devlog posts ({total - rendered} already current)')
+        )
+
+    def render_chunk(self, posts, render, executor, workers):
+        sources = [post.content_md for post in posts]
+        if executor is None:
+            html = map(render, sources)
+        else:
+            html = executor.map(render, sources, chunksize=max(1, len(sources) // (workers * 4)))
+        for post, content_html in zip(posts, html):
+            post.content_html = content_html
+        DevlogPost.objects.bulk_update(posts, ['content_html', 'content_hash'], batch_size=500)
+        return len(posts)
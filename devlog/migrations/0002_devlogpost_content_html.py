@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devlog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devlogpost',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='Hash of the Markdown source and renderer config content_html was built from', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='devlogpost',
+            name='content_html',
+            field=models.TextField(blank=True, help_text='Markdown content rendered to HTML'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devlog', '0002_devlogpost_content_html'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='devlogpost',
+            index=models.Index(fields=['status', '-published_at', '-id'], name='devlog_published_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_tag'),
+        ('devlog', '0003_devlogpost_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devlogpost',
+            name='tag_set',
+            field=models.ManyToManyField(blank=True, related_name='devlog_posts', to='core.tag'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations
+from django.utils.text import slugify
+
+# Kept separate from the schema changes around it: PostgreSQL can't ALTER a
+# table with pending deferred-constraint checks in the same transaction.
+
+
+def split_names(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def get_or_create_tag(Tag, name, cache):
+    """Return the tag named ``name`` (case-insensitively), creating it with a unique slug."""
+    key = name.lower()
+    if key not in cache:
+        tag = Tag.objects.filter(name__iexact=name).first()
+        if tag is None:
+            base = slugify(name) or 'tag'
+            slug, suffix = base, 2
+            while Tag.objects.filter(slug=slug).exists():
+                slug, suffix = f'{base}-{suffix}', suffix + 1
+            tag = Tag.objects.create(name=name[:50], slug=slug)
+        cache[key] = tag
+    return cache[key]
+
+
+def tags_to_tag_set(apps, schema_editor):
+    Tag = apps.get_model('core', 'Tag')
+    DevlogPost = apps.get_model('devlog', 'DevlogPost')
+    cache = {}
+    for post in DevlogPost.objects.all():
+        post.tag_set.set([get_or_create_tag(Tag, name, cache) for name in split_names(post.tags)])
+
+
+def tag_set_to_tags(apps, schema_editor):
+    DevlogPost = apps.get_model('devlog', 'DevlogPost')
+    for post in DevlogPost.objects.prefetch_related('tag_set'):
+        post.tags = ', '.join(tag.name for tag in post.tag_set.all())
+        post.save(update_fields=['tags'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devlog', '0004_devlogpost_tag_set'),
+    ]
+
+    operations = [
+        migrations.RunPython(tags_to_tag_set, tag_set_to_tags),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devlog', '0005_devlogpost_tags_to_tag_set'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='devlogpost',
+            name='tags',
+        ),
+        migrations.RenameField(
+            model_name='devlogpost',
+            old_name='tag_set',
+            new_name='tags',
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.urls import reverse
-from core.models import Project
+from core.models import Project, Tag
+from core.rendering import DEVLOG_EXTENSIONS, render_hash, render_markdown
 
 
 class DevlogPost(models.Model):
@@ -12,6 +13,12 @@ class DevlogPost(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True)
     content_md = models.TextField(help_text="Markdown content")
+    content_html = models.TextField(blank=True, help_text="Markdown content rendered to HTML")
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Hash of the Markdown source and renderer config content_html was built from"
+    )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
     published_at = models.DateTimeField(blank=True, null=True)
     project = models.ForeignKey(
@@ -21,16 +28,16 @@ class DevlogPost(models.Model):
         null=True,
         related_name='devlog_posts'
     )
-    tags = models.CharField(
-        max_length=500,
-        blank=True,
-        help_text="Comma-separated tags"
-    )
+    tags = models.ManyToManyField(Tag, blank=True, related_name='devlog_posts')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            # Serves the keyset-paginated list of published posts
+            models.Index(fields=['status', '-published_at', '-id'], name='devlog_published_keyset_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -39,8 +46,23 @@ class DevlogPost(models.Model):
         return reverse('devlog_detail', kwargs={'slug': self.slug})
 
     def get_tags_list(self):
-        """Return tags as a list of strings."""
-        return [t.strip() for t in self.tags.split(',') if t.strip()]
+        """Return the post's tags (uses prefetch_related('tags') when available)."""
+        return list(self.tags.all())
+
+    def refresh_content_html(self):
+        """Re-render content_html if the content or renderer config changed. Return True if it did."""
+        content_hash = render_hash(self.content_md, DEVLOG_EXTENSIONS)
+        if content_hash == self.content_hash:
+            return False
+        self.content_html = render_markdown(self.content_md, DEVLOG_EXTENSIONS)
+        self.content_hash = content_hash
+        return True
+
+    def get_content_html(self):
+        """Return the rendered content, re-rendering and saving it first if it's stale."""
+        if self.refresh_content_html():
+            self.save(update_fields=['content_html', 'content_hash'])
+        return self.content_html
 
     @property
     def is_published(self):
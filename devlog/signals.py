@@ -0,0 +1,29 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from core.feed import update_post_entry
+from core.models import ContentVersion
+from .models import DevlogPost
+
+# Fields written when stored HTML is lazily re-rendered; the page is already current
+RENDER_FIELDS = {'content_html', 'content_hash'}
+
+
+@receiver(post_save, sender=DevlogPost)
+@receiver(post_delete, sender=DevlogPost)
+def invalidate_devlog_pages(sender, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= RENDER_FIELDS:
+        return
+    ContentVersion.bump(ContentVersion.DEVLOG)
+
+
+@receiver(post_save, sender=DevlogPost)
+def update_devlog_feed(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= RENDER_FIELDS:
+        return
+    update_post_entry(instance)
+
+
+@receiver(m2m_changed, sender=DevlogPost.tags.through)
+def invalidate_tagged_devlog_pages(sender, action, **kwargs):
+    if action.startswith('post_'):
+        ContentVersion.bump(ContentVersion.DEVLOG)
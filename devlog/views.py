@@ -1,22 +1,33 @@
 from django.shortcuts import render, get_object_or_404
-from django.utils import timezone
+from core.conditional import conditional_page
+from core.models import ContentVersion
+from core.pagecache import cache_page
+from core.pagination import paginate_keyset
 from .models import DevlogPost
-from markdown import Markdown
 
+DEVLOG_SCOPES = (ContentVersion.DEVLOG, ContentVersion.PROJECTS)
+POSTS_PER_PAGE = 20
 
+
+@conditional_page(*DEVLOG_SCOPES)
+@cache_page(*DEVLOG_SCOPES)
 def devlog_list(request):
-    """List of published devlog posts."""
+    """List of published devlog posts, newest first, paginated by (published_at, id)."""
     posts = DevlogPost.objects.filter(
         status='published',
         published_at__isnull=False
-    ).order_by('-published_at')
+    ).select_related('project').prefetch_related('tags')
+    page = paginate_keyset(posts, request, 'published_at', POSTS_PER_PAGE)
     
     context = {
-        'posts': posts,
+        'posts': page.items,
+        'page': page,
     }
     return render(request, 'devlog/list.html', context)
 
 
+@conditional_page(*DEVLOG_SCOPES)
+@cache_page(*DEVLOG_SCOPES)
 def devlog_detail(request, slug):
     """Devlog post detail page with Markdown rendering."""
     post = get_object_or_404(
@@ -26,9 +37,8 @@ def devlog_detail(request, slug):
         published_at__isnull=False
     )
     
-    # Convert Markdown to HTML
-    md = Markdown(extensions=['fenced_code', 'tables', 'codehilite'])
-    content_html = md.convert(post.content_md)
+    # HTML is rendered when the post is saved; stale posts re-render lazily
+    content_html = post.get_content_html()
     
     # Get related posts (same project if available)
     related_posts = DevlogPost.objects.filter(
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import RepoSnapshot, RepoActivityPoint, UserContributionDay
+from .models import RepoSnapshot, RepoActivityPoint, UserContributionDay, ApiCacheEntry, PendingStatsRequest, SyncLock, SyncRun
 
 
 @admin.register(RepoSnapshot)
@@ -7,7 +7,7 @@ class RepoSnapshotAdmin(admin.ModelAdmin):
     list_display = ('repo_full_name', 'language', 'stars', 'forks', 'open_issues', 'fetched_at', 'updated_at')
     list_filter = ('language', 'fetched_at')
     search_fields = ('repo_full_name', 'description')
-    readonly_fields = ('fetched_at', 'updated_at')
+    readonly_fields = ('readme_html', 'readme_hash', 'fetched_at', 'updated_at')
     ordering = ('-fetched_at',)
 
 
@@ -28,3 +28,34 @@ class UserContributionDayAdmin(admin.ModelAdmin):
     ordering = ('-day', 'username')
     date_hierarchy = 'day'
 
+
+@admin.register(ApiCacheEntry)
+class ApiCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ('url', 'etag', 'last_modified', 'updated_at')
+    search_fields = ('url',)
+    readonly_fields = ('updated_at',)
+    ordering = ('url',)
+
+
+@admin.register(PendingStatsRequest)
+class PendingStatsRequestAdmin(admin.ModelAdmin):
+    list_display = ('repo_full_name', 'attempts', 'first_requested_at', 'last_requested_at', 'next_attempt_at')
+    search_fields = ('repo_full_name',)
+    ordering = ('next_attempt_at',)
+
+
+@admin.register(SyncLock)
+class SyncLockAdmin(admin.ModelAdmin):
+    list_display = ('name', 'owner', 'expires_at', 'last_completed_at')
+    readonly_fields = ('name', 'owner', 'expires_at', 'last_completed_at')
+
+
+@admin.register(SyncRun)
+class SyncRunAdmin(admin.ModelAdmin):
+    list_display = ('started_at', 'status', 'duration_seconds', 'requests', 'bytes', 'db_seconds', 'rows_written')
+    list_filter = ('status',)
+    date_hierarchy = 'started_at'
+    readonly_fields = (
+        'started_at', 'finished_at', 'status', 'duration_seconds', 'requests', 'bytes', 'db_seconds',
+        'rows_written', 'report',
+    )
@@ -0,0 +1,274 @@
+"""
+Thin client for the GitHub REST API used by sync_github.
+
+All requests go through one keep-alive ``requests.Session`` whose connection
+pool is sized to the number of worker threads, so concurrent fetches reuse
+pooled connections to api.github.com instead of opening a new one per call.
+
+JSON endpoints are fetched conditionally: the ETag/Last-Modified validators of
+the previous response are sent back, and a 304 reuses the stored body. GitHub
+doesn't count 304s against the rate limit.
+
+The rate-limit headers of every response are fed to an optional
+``RateBudget`` (see ``githubsync.ratelimit``), and each request's latency,
+size and status to an optional ``SyncMetrics`` (see ``githubsync.metrics``).
+
+GraphQL is used for the one query REST has no equivalent for: a user's
+contribution calendar, which needs an authenticated token.
+"""
+
+import base64
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from githubsync.models import ApiCacheEntry
+
+API_URL = 'https://api.github.com'
+GRAPHQL_PATH = '/graphql'
+
+CONTRIBUTION_CALENDAR_QUERY = """
+query($login: String!, $from: DateTime!, $to: DateTime!) {
+  user(login: $login) {
+    contributionsCollection(from: $from, to: $to) {
+      contributionCalendar {
+        weeks {
+          contributionDays {
+            date
+            contributionCount
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+@dataclass
+class ApiResult:
+    """Decoded response of a JSON endpoint."""
+    status_code: int
+    data: object = None
+    not_modified: bool = False
+
+
+@dataclass
+class RepoFetch:
+    """Raw GitHub payloads fetched for a single repository."""
+    repo_full_name: str
+    repo_data: dict
+    readme_content: str = ''
+    stats_status: int = None
+    commit_activity: list = None
+    stats_error: Exception = None
+    not_modified: bool = False
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """GitHub refused a request because the rate limit is used up."""
+
+
+class GraphQLError(requests.exceptions.RequestException):
+    """A GraphQL query came back with errors instead of data."""
+
+
+class ConditionalCache:
+    """
+    Validator cache backed by ``ApiCacheEntry``.
+
+    Entries are loaded once up front and changes are buffered in memory, so
+    worker threads never touch the database; call ``save()`` from the main
+    thread once fetching is done.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {
+            entry['url']: entry
+            for entry in ApiCacheEntry.objects.values('url', 'etag', 'last_modified', 'body')
+        }
+        self._dirty = {}
+
+    def get(self, url):
+        with self._lock:
+            return self._entries.get(url)
+
+    def set(self, url, etag, last_modified, body):
+        entry = {'url': url, 'etag': etag, 'last_modified': last_modified, 'body': body}
+        with self._lock:
+            self._entries[url] = entry
+            self._dirty[url] = entry
+
+    def save(self):
+        """Persist entries updated since the last save; return how many were written."""
+        with self._lock:
+            dirty, self._dirty = list(self._dirty.values()), {}
+        if dirty:
+            ApiCacheEntry.objects.bulk_create(
+                [ApiCacheEntry(**entry) for entry in dirty],
+                update_conflicts=True,
+                unique_fields=['url'],
+                update_fields=['etag', 'last_modified', 'body', 'updated_at'],
+            )
+        return len(dirty)
+
+
+class GitHubClient:
+    """Pooled GitHub API client, safe to share between worker threads."""
+
+    def __init__(self, token=None, base_url=API_URL, pool_size=10, cache=None, budget=None, metrics=None):
+        self.base_url = base_url.rstrip('/')
+        self.cache = cache
+        self.budget = budget
+        self.metrics = metrics
+        self.authenticated = bool(token)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Accept'] = 'application/vnd.github.v3+json'
+        if token:
+            self.session.headers['Authorization'] = f'token {token}'
+
+    def close(self):
+        self.session.close()
+
+    def _request(self, method, url, **kwargs):
+        """Send a request through the pooled session, recording it in the metrics."""
+        start = time.perf_counter()
+        response = self.session.request(method, url, **kwargs)
+        if self.metrics is not None:
+            path = url[len(self.base_url):].split('?', 1)[0]
+            self.metrics.record_request(path, response.status_code, time.perf_counter() - start, len(response.content))
+        self.check_rate_limit(response)
+        return response
+
+    def get(self, path, params=None, timeout=10):
+        return self._request('GET', f'{self.base_url}{path}', params=params, timeout=timeout)
+
+    def check_rate_limit(self, response):
+        """Feed the response's quota headers to the budget; raise if the quota is used up."""
+        if self.budget is not None:
+            self.budget.update(response.headers)
+        if response.status_code in (403, 429) and response.headers.get('X-RateLimit-Remaining') == '0':
+            raise RateLimitExceeded(f'{response.status_code} response for {response.url}: rate limit exceeded')
+
+    def fetch_rate_limit(self):
+        """Load the current quota from ``/rate_limit`` into the budget (this call is free)."""
+        response = self._request('GET', f'{self.base_url}/rate_limit', timeout=10)
+        if response.status_code == 200 and self.budget is not None:
+            self.budget.update_from_rate_limit(response.json())
+
+    def get_json(self, path, params=None, timeout=10):
+        """
+        GET a JSON endpoint, revalidating against the cache when enabled.
+
+        Only 200 responses are decoded; any other status is returned with
+        ``data=None`` for the caller to interpret.
+        """
+        url = requests.Request('GET', f'{self.base_url}{path}', params=params).prepare().url
+        entry = self.cache.get(url) if self.cache is not None else None
+
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._request('GET', url, timeout=timeout, headers=headers)
+        if response.status_code == 304 and entry:
+            return ApiResult(200, entry['body'], not_modified=True)
+        if response.status_code != 200:
+            return ApiResult(response.status_code)
+
+        data = response.json()
+        etag = response.headers.get('ETag', '')
+        last_modified = response.headers.get('Last-Modified', '')
+        if self.cache is not None and (etag or last_modified):
+            self.cache.set(url, etag, last_modified, data)
+        return ApiResult(200, data)
+
+    def graphql(self, query, variables=None, timeout=30):
+        """Run a GraphQL query and return its ``data``; raise on HTTP or GraphQL errors."""
+        response = self._request(
+            'POST',
+            f'{self.base_url}{GRAPHQL_PATH}',
+            json={'query': query, 'variables': variables or {}},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get('errors'):
+            raise GraphQLError('; '.join(error.get('message', '') for error in payload['errors']))
+        return payload['data']
+
+    def fetch_contribution_calendar(self, username, start, end):
+        """
+        Return ``{date: count}`` for every day of ``username``'s contribution
+        calendar from ``start`` to ``end`` (datetimes at most a year apart).
+        """
+        data = self.graphql(
+            CONTRIBUTION_CALENDAR_QUERY,
+            {'login': username, 'from': start.isoformat(), 'to': end.isoformat()},
+        )
+        if not data.get('user'):
+            raise GraphQLError(f'Could not resolve to a User with the login of {username!r}')
+        weeks = data['user']['contributionsCollection']['contributionCalendar']['weeks']
+        return {
+            date.fromisoformat(day['date']): day['contributionCount']
+            for week in weeks
+            for day in week['contributionDays']
+        }
+
+    def fetch_repo(self, repo_full_name):
+        """
+        Fetch metadata, README and commit activity for one repository.
+
+        Raises ``requests.exceptions.RequestException`` if the repository
+        itself can't be fetched. README failures are ignored and stats
+        failures are recorded on the result, so the snapshot can still be
+        stored.
+        """
+        repo = self.get_json(f'/repos/{repo_full_name}')
+        if repo.status_code != 200:
+            raise requests.exceptions.HTTPError(f'{repo.status_code} response for /repos/{repo_full_name}')
+        result = RepoFetch(repo_full_name=repo_full_name, repo_data=repo.data)
+        not_modified = [repo.not_modified]
+
+        try:
+            readme = self.get_json(f'/repos/{repo_full_name}/readme')
+            if readme.status_code == 200:
+                not_modified.append(readme.not_modified)
+                result.readme_content = base64.b64decode(readme.data.get('content', '')).decode('utf-8')
+        except (requests.exceptions.RequestException, ValueError, KeyError):
+            # README might not exist or might not be accessible
+            pass
+
+        try:
+            stats = self.fetch_commit_activity(repo_full_name)
+            result.stats_status = stats.status_code
+            if stats.status_code == 200:
+                not_modified.append(stats.not_modified)
+                result.commit_activity = stats.data
+        except requests.exceptions.RequestException as e:
+            result.stats_error = e
+
+        # Only responses that can be revalidated count: a missing README or stats
+        # GitHub is still computing (404, 202) come back the same on every run
+        result.not_modified = all(not_modified)
+        return result
+
+    def fetch_commit_activity(self, repo_full_name):
+        """
+        Fetch a repo's weekly commit activity for the last year.
+
+        GitHub computes these stats in the background and answers 202 until
+        they're ready; the caller should retry later.
+        """
+        return self.get_json(f'/repos/{repo_full_name}/stats/commit_activity', timeout=30)
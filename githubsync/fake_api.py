@@ -0,0 +1,273 @@
+"""
+Local stand-in for the parts of the GitHub REST API that sync_github uses.
+
+``FakeGitHub`` serves, from a background thread:
+
+- ``/repos/<owner>/<repo>``, ``.../readme`` and ``.../stats/commit_activity``
+  for any repo name, with content derived from the name (so it's the same on
+  every request and ETags are stable);
+- ``/users/<username>/events/public``, paginated like GitHub's;
+- ``/rate_limit``.
+
+Behaviour is set by ``FakeConfig``: per-response latency, ETag validation
+(304s), how many times commit stats answer 202 before they're ready, a share
+of repos that answer 403, and an hourly rate limit that's spent by every
+response except 304s and ``/rate_limit`` (as on GitHub) and answers 403 with
+``X-RateLimit-Remaining: 0`` once used up.
+
+It's used by the ``fake_github`` and ``bench_sync`` commands; point
+sync_github at it with the ``GITHUB_API_URL`` setting.
+"""
+
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+EVENTS_PER_PAGE = 30
+MAX_EVENT_PAGES = 10
+STATS_WEEKS = 52
+
+
+@dataclass
+class FakeConfig:
+    latency_ms: float = 0
+    jitter_ms: float = 0
+    etags: bool = True
+    stats_pending: int = 0  # 202 responses per repo before its stats are ready
+    forbidden_rate: float = 0  # Share of repos answering 403
+    rate_limit: int = 5000
+    event_pages: int = 3
+
+
+def seed_for(name):
+    return int(hashlib.sha256(name.encode('utf-8')).hexdigest()[:8], 16)
+
+
+class FakeGitHub:
+    """A fake GitHub API server on ``127.0.0.1``; use as a context manager or call start()/stop()."""
+
+    def __init__(self, config=None, port=0):
+        self.config = config or FakeConfig()
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), FakeHandler)
+        self.server.daemon_threads = True
+        self.server.fake = self
+        self._thread = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def reset(self):
+        """Restore the full rate limit and forget served requests and pending stats."""
+        with self._lock:
+            self.remaining = self.config.rate_limit
+            self.reset_at = int(time.time()) + 3600
+            self.stats_requests = Counter()
+            self.statuses = Counter()
+            self.requests = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='fake-github', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def spend(self):
+        """Charge one request to the rate limit; return False if it's used up."""
+        with self._lock:
+            if time.time() >= self.reset_at:
+                self.remaining = self.config.rate_limit
+                self.reset_at = int(time.time()) + 3600
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    def record(self, status):
+        with self._lock:
+            self.requests += 1
+            self.statuses[status] += 1
+
+    def stats_ready(self, repo_full_name):
+        with self._lock:
+            self.stats_requests[repo_full_name] += 1
+            return self.stats_requests[repo_full_name] > self.config.stats_pending
+
+    def is_forbidden(self, repo_full_name):
+        return seed_for(repo_full_name) % 10000 < self.config.forbidden_rate * 10000
+
+    def rate_limit_headers(self):
+        with self._lock:
+            return {
+                'X-RateLimit-Limit': str(self.config.rate_limit),
+                'X-RateLimit-Remaining': str(self.remaining),
+                'X-RateLimit-Reset': str(self.reset_at),
+                'X-RateLimit-Resource': 'core',
+            }
+
+    def repo(self, repo_full_name):
+        rng = random.Random(seed_for(repo_full_name))
+        pushed_at = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=rng.randint(0, 60 * 24 * 600))
+        return {
+            'full_name': repo_full_name,
+            'description': f'Synthetic repository {repo_full_name}',
+            'language': rng.choice(['Python', 'JavaScript', 'Go', 'Rust', None]),
+            'stargazers_count': rng.randint(0, 500),
+            'forks_count': rng.randint(0, 50),
+            'open_issues_count': rng.randint(0, 30),
+            'pushed_at': pushed_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        }
+
+    def readme(self, repo_full_name):
+        text = (
+            f'# {repo_full_name}\n\nSynthetic README served by the fake GitHub API.\n\n'
+            f'```python\nprint({repo_full_name!r})\n```\n'
+        )
+        return {'encoding': 'base64', 'content': base64.b64encode(text.encode('utf-8')).decode('ascii')}
+
+    def commit_activity(self, repo_full_name):
+        rng = random.Random(seed_for(repo_full_name) + 1)
+        now = int(time.time())
+        # Weeks start on Sunday, 00:00 UTC (the epoch was a Thursday)
+        this_week = now - (now + 4 * 86400) % (7 * 86400)
+        weeks = []
+        for index in reversed(range(STATS_WEEKS)):
+            days = [rng.choice([0, 0, 1, 2, 4]) for _ in range(7)]
+            weeks.append({'week': this_week - index * 7 * 86400, 'days': days, 'total': sum(days)})
+        return weeks
+
+    def events(self, username, page, per_page):
+        if page > self.config.event_pages:
+            return []
+        rng = random.Random(seed_for(username) + page)
+        # Anchored to midnight so responses (and their ETags) are stable through the day
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        start = today - timedelta(days=(page - 1) * 7)
+        return [
+            {
+                'type': rng.choice(['PushEvent', 'PushEvent', 'PullRequestEvent', 'IssuesEvent']),
+                'created_at': (start - timedelta(hours=index * 7 * 24 / per_page)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            }
+            for index in range(per_page)
+        ]
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def fake(self):
+        return self.server.fake
+
+    # (path pattern, handler method): the first pattern matching the whole path, without slashes
+    # at either end, picks the method, which gets the parsed query string and the pattern's groups
+    ROUTES = [
+        (re.compile(r'rate_limit'), 'get_rate_limit'),
+        (re.compile(r'repos/([^/]+/[^/]+)'), 'get_repo'),
+        (re.compile(r'repos/([^/]+/[^/]+)/readme'), 'get_readme'),
+        (re.compile(r'repos/([^/]+/[^/]+)/stats/commit_activity'), 'get_commit_activity'),
+        (re.compile(r'users/([^/]+)/events/public'), 'get_events'),
+    ]
+
+    def do_GET(self):
+        config = self.fake.config
+        if config.latency_ms or config.jitter_ms:
+            time.sleep((config.latency_ms + random.uniform(0, config.jitter_ms)) / 1000)
+
+        url = urlparse(self.path)
+        for pattern, handler in self.ROUTES:
+            match = pattern.fullmatch(url.path.strip('/'))
+            if match:
+                return getattr(self, handler)(parse_qs(url.query), *match.groups())
+        return self.send_not_found()
+
+    def get_rate_limit(self, query):
+        with self.fake._lock:
+            core = {'limit': self.fake.config.rate_limit, 'remaining': self.fake.remaining, 'reset': self.fake.reset_at}
+        return self.send_json({'resources': {'core': core}}, charge=False)
+
+    def get_repo(self, query, repo_full_name):
+        if self.fake.is_forbidden(repo_full_name):
+            return self.send_forbidden()
+        return self.send_json(self.fake.repo(repo_full_name))
+
+    def get_readme(self, query, repo_full_name):
+        if self.fake.is_forbidden(repo_full_name):
+            return self.send_forbidden()
+        return self.send_json(self.fake.readme(repo_full_name))
+
+    def get_commit_activity(self, query, repo_full_name):
+        if self.fake.is_forbidden(repo_full_name):
+            return self.send_forbidden()
+        if not self.fake.stats_ready(repo_full_name):
+            return self.send_json({}, status=202)
+        return self.send_json(self.fake.commit_activity(repo_full_name))
+
+    def get_events(self, query, username):
+        page = int(query.get('page', ['1'])[0])
+        per_page = min(int(query.get('per_page', [str(EVENTS_PER_PAGE)])[0]), 100)
+        if page > MAX_EVENT_PAGES:
+            return self.send_json({'message': 'In order to keep the API fast for everyone, '
+                                              'pagination is limited for this resource.'}, status=422)
+        return self.send_json(self.fake.events(username, page, per_page))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        self.send_not_found()
+
+    def send_not_found(self):
+        return self.send_json({'message': 'Not Found'}, status=404)
+
+    def send_forbidden(self):
+        return self.send_json({'message': 'Resource not accessible'}, status=403)
+
+    def send_json(self, payload, status=200, charge=True):
+        body = json.dumps(payload).encode('utf-8')
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"' if status == 200 and self.fake.config.etags else None
+        if etag and self.headers.get('If-None-Match') == etag:
+            # Conditional hits don't count against the rate limit
+            status, body = 304, b''
+        elif charge and not self.fake.spend():
+            status, etag = 403, None
+            body = json.dumps({'message': 'API rate limit exceeded'}).encode('utf-8')
+
+        self.fake.record(status)
+        self.send_response(status)
+        for name, value in self.fake.rate_limit_headers().items():
+            self.send_header(name, value)
+        if etag:
+            self.send_header('ETag', etag)
+        if body:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
@@ -0,0 +1,147 @@
+"""
+Contribution heatmap data shared by the home and project list pages.
+
+Each user-year is stored as a compact ``array('H')`` of daily counts indexed
+by day of the year, together with the year's maximum. It's cached without a
+timeout under the current 'contributions' content version, which sync_github
+bumps whenever it writes contribution days.
+
+The pages embed the grid as HTML rendered here rather than in a template
+loop: one bare element per day, shaded by a level class (``l0``-``l4``, the
+steps of the legend) instead of an inline style. The fragment depends on
+today's date too (future days are dimmed), so it's cached per day.
+
+Every stored year can be shown: ``get_contribution_years`` lists them with
+their totals from the monthly rollups, for the pages' year selector.
+"""
+
+from array import array
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.utils.html import format_html_join
+
+from core.models import ContentVersion
+from githubsync.models import UserContributionDay
+from githubsync.rollups import contribution_year_totals
+
+MAX_COUNT = 0xFFFF
+LEVELS = 4
+# Long enough to cover the day the fragment was rendered for
+HTML_TIMEOUT = 2 * 24 * 3600
+
+
+def level(count, max_count):
+    """Return the shade of a day with ``count`` contributions: 0 for none, else 1 to LEVELS."""
+    if count <= 0 or max_count <= 0:
+        return 0
+    return min(LEVELS, -(-count * LEVELS // max_count))
+
+
+class Heatmap:
+    """Daily contribution counts for one user and year."""
+
+    def __init__(self, year, counts, max_count):
+        self.year = year
+        self.counts = counts
+        self.max_count = max_count
+
+    def days(self, today):
+        """Return a ``(day, count, is_future)`` tuple for every day of the year."""
+        year_start = date(self.year, 1, 1)
+        days = []
+        for offset, count in enumerate(self.counts):
+            day = year_start + timedelta(days=offset)
+            days.append((day, count, day > today))
+        return days
+
+    def render(self, today):
+        """Return the HTML of the grid's cells, one ``<i>`` per day."""
+        return format_html_join('', '<i class="{}" title="{}: {} contribution{}"></i>', (
+            (
+                'future' if is_future else f'l{level(count, self.max_count)}',
+                day.strftime('%b %d, %Y'),
+                count,
+                '' if count == 1 else 's',
+            )
+            for day, count, is_future in self.days(today)
+        ))
+
+
+def build_heatmap(username, year):
+    """Build a heatmap from the stored contribution days."""
+    year_start = date(year, 1, 1)
+    year_end = date(year, 12, 31)
+    counts = array('H', bytes(2 * ((year_end - year_start).days + 1)))
+
+    contribution_days = UserContributionDay.objects.filter(
+        username=username,
+        day__gte=year_start,
+        day__lte=year_end
+    ).values_list('day', 'count')
+    for day, count in contribution_days:
+        counts[(day - year_start).days] = min(max(count, 0), MAX_COUNT)
+
+    return Heatmap(year, counts, max(counts))
+
+
+def get_heatmap(username, year):
+    """Return the cached heatmap for ``username``'s ``year``, building it on a miss."""
+    key = f'heatmap:{username}:{year}:{ContentVersion.current(ContentVersion.CONTRIBUTIONS)}'
+    heatmap = cache.get(key)
+    if heatmap is None:
+        heatmap = build_heatmap(username, year)
+        cache.set(key, heatmap, None)
+    return heatmap
+
+
+def get_heatmap_html(username, year, today, version=None):
+    """Return the cached grid HTML for ``username``'s ``year`` as of ``today``, rendering it on a miss."""
+    if version is None:
+        version = ContentVersion.current(ContentVersion.CONTRIBUTIONS)
+    key = f'heatmap-html:{username}:{year}:{today.isoformat()}:{version}'
+    html = cache.get(key)
+    if html is None:
+        html = get_heatmap(username, year).render(today)
+        cache.set(key, html, HTML_TIMEOUT)
+    return html
+
+
+def get_contribution_years(username, today, version=None):
+    """Return ``[(year, contributions)]`` for every stored year and the current one, latest first."""
+    if version is None:
+        version = ContentVersion.current(ContentVersion.CONTRIBUTIONS)
+    key = f'heatmap-years:{username}:{version}'
+    totals = cache.get(key)
+    if totals is None:
+        totals = contribution_year_totals(username)
+        cache.set(key, totals, None)
+    years = dict(totals)
+    years.setdefault(today.year, 0)
+    return sorted(years.items(), reverse=True)
+
+
+def heatmap_context(username, requested_year, today):
+    """
+    Return the template context of a page's heatmap: the grid of
+    ``requested_year`` (a ``?year=`` parameter) if it's a stored year, else
+    of the current one, and the years to choose from.
+    """
+    version = ContentVersion.current(ContentVersion.CONTRIBUTIONS)
+    years = get_contribution_years(username, today, version)
+    try:
+        year = int(requested_year)
+    except (TypeError, ValueError):
+        year = today.year
+    if year not in dict(years):
+        year = today.year
+    return {
+        'heatmap_html': get_heatmap_html(username, year, today, version),
+        'heatmap_years': years,
+        'year': year,
+    }
+
+
+def invalidate_heatmaps():
+    """Invalidate every cached heatmap; call after contribution days change."""
+    ContentVersion.bump(ContentVersion.CONTRIBUTIONS)
@@ -0,0 +1,62 @@
+"""
+Cross-process lease for sync_github, backed by the ``SyncLock`` table.
+
+``SyncLease`` takes the lease and renews it from a heartbeat thread for as
+long as the sync runs. If a renewal finds the lease taken over (the process
+stalled past its expiry), ``on_lost`` is called so the run can stop early
+instead of racing the new holder.
+"""
+
+import os
+import socket
+import threading
+import uuid
+from datetime import timedelta
+
+from django.db import DatabaseError, connection
+
+from githubsync.models import SyncLock
+
+LEASE = timedelta(minutes=5)
+HEARTBEAT_SECONDS = 60
+
+
+class SyncLease:
+    def __init__(self, name, lease=LEASE, on_lost=None):
+        self.name = name
+        self.lease = lease
+        self.on_lost = on_lost
+        self.owner = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    def acquire(self):
+        """Take the lease and start renewing it; return False if another process holds it."""
+        if not SyncLock.acquire(self.name, self.owner, self.lease):
+            return False
+        self._stop.clear()
+        self._heartbeat = threading.Thread(target=self._renew, name=f'{self.name}-lease', daemon=True)
+        self._heartbeat.start()
+        return True
+
+    def release(self, completed=False):
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        SyncLock.release(self.name, self.owner, completed=completed)
+
+    def _renew(self):
+        try:
+            while not self._stop.wait(HEARTBEAT_SECONDS):
+                try:
+                    renewed = SyncLock.renew(self.name, self.owner, self.lease)
+                except DatabaseError:
+                    continue  # Try again on the next beat; the lease outlasts a few misses
+                if not renewed:
+                    if self.on_lost:
+                        self.on_lost()
+                    return
+        finally:
+            # This thread has its own database connection
+            connection.close()
@@ -0,0 +1,183 @@
+"""
+Management command to measure sync_github throughput against a fake GitHub.
+
+Starts a ``FakeGitHub`` (see githubsync.fake_api) in-process and runs
+sync_github against N synthetic repos once per combination of --concurrency
+and cache mode:
+
+- ``none``: conditional requests off (--no-cache), every response in full;
+- ``cold``: conditional requests on, but nothing cached yet (a first sync);
+- ``warm``: after an untimed priming run, so unchanged endpoints are 304s
+  (the steady state of a scheduled sync).
+
+The synced repos are only the synthetic ones, not the projects in the
+database, and everything the runs wrote (snapshots, activity and its rollups,
+cached responses, pending stats, contribution days of the bench user, its own
+SyncRun rows and lock) is deleted afterwards unless --keep is given. The runs
+take their own lock rather than sync_github's and don't bump content versions,
+so a sync daemon and the page cache are unaffected.
+"""
+
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from githubsync.fake_api import FakeGitHub
+from githubsync.management.commands.fake_github import add_fake_arguments, fake_config
+from githubsync.management.commands.sync_github import Command as SyncCommand
+from githubsync.models import (
+    ApiCacheEntry, PendingStatsRequest, RepoActivityPoint, RepoActivityRollup, RepoSnapshot, SyncLock, SyncRun,
+    UserContributionDay, UserContributionRollup,
+)
+
+REPO_OWNER = 'bench-sync'
+USERNAME = 'bench-sync'
+MODES = ['none', 'cold', 'warm']
+LOCK_NAME = 'bench_sync'
+
+
+class BenchSyncCommand(SyncCommand):
+    """sync_github over a fixed list of repos instead of the projects', leaving real syncs and pages alone."""
+    lock_name = LOCK_NAME
+
+    def __init__(self, repos, run_ids, **kwargs):
+        super().__init__(**kwargs)
+        self.repos = repos
+        self.run_ids = run_ids
+
+    def repo_names(self):
+        return list(self.repos)
+
+    def invalidate_pages(self, **changed):
+        # Nothing public is built from the synthetic repos or the bench user
+        pass
+
+    def record_run(self, *args, **kwargs):
+        run = super().record_run(*args, **kwargs)
+        self.run_ids.append(run.pk)
+        return run
+
+    def prune_runs(self):
+        # Bench runs are deleted by clean_up; pruning here would push real runs out of the history
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Time sync_github against a local fake GitHub API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repos', type=int, default=200, help='Synthetic repos to sync (default: 200)')
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            nargs='+',
+            default=[1, 4, 8],
+            help='Worker counts to compare (default: 1 4 8)',
+        )
+        parser.add_argument(
+            '--modes',
+            nargs='+',
+            choices=MODES,
+            default=MODES,
+            help='Cache modes to compare (default: none cold warm)',
+        )
+        parser.add_argument(
+            '--stats-max-wait',
+            type=int,
+            default=60,
+            help="Passed to sync_github: seconds to keep retrying 202 commit stats (default: 60)",
+        )
+        parser.add_argument('--output', type=str, help='Write the results as JSON to this file')
+        parser.add_argument('--keep', action='store_true', help='Keep the data the last run wrote')
+        add_fake_arguments(parser)
+
+    def handle(self, *args, **options):
+        if options['repos'] < 1:
+            raise CommandError('--repos must be at least 1')
+
+        self.repos = [f'{REPO_OWNER}/repo-{number:05d}' for number in range(1, options['repos'] + 1)]
+        self.run_ids = []
+        results = []
+
+        with FakeGitHub(fake_config(options)) as fake, override_settings(GITHUB_API_URL=fake.url):
+            try:
+                for mode in options['modes']:
+                    for concurrency in options['concurrency']:
+                        results.append(self.measure(fake, mode, concurrency, options))
+                        self.print_result(results[-1])
+            finally:
+                if not options['keep']:
+                    self.clean_up(fake)
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2) + '\n')
+            self.stdout.write(f'Wrote results to {options["output"]}')
+
+    def clean_up(self, fake):
+        RepoSnapshot.objects.filter(repo_full_name__startswith=f'{REPO_OWNER}/').delete()
+        RepoActivityPoint.objects.filter(repo_full_name__startswith=f'{REPO_OWNER}/').delete()
+        RepoActivityRollup.objects.filter(repo_full_name__startswith=f'{REPO_OWNER}/').delete()
+        PendingStatsRequest.objects.filter(repo_full_name__startswith=f'{REPO_OWNER}/').delete()
+        ApiCacheEntry.objects.filter(url__startswith=fake.url).delete()
+        UserContributionDay.objects.filter(username=USERNAME).delete()
+        UserContributionRollup.objects.filter(username=USERNAME).delete()
+        SyncRun.objects.filter(pk__in=self.run_ids).delete()
+        SyncLock.objects.filter(name=LOCK_NAME).delete()
+
+    def measure(self, fake, mode, concurrency, options):
+        self.clean_up(fake)
+        fake.reset()
+        if mode == 'warm':
+            self.run_sync(concurrency, use_cache=True, options=options)
+
+        report = self.run_sync(concurrency, use_cache=mode != 'none', options=options)
+        statuses = {}
+        for endpoint in report['endpoints'].values():
+            for status, count in endpoint['statuses'].items():
+                statuses[status] = statuses.get(status, 0) + count
+        seconds = report['duration_seconds']
+        return {
+            'mode': mode,
+            'concurrency': concurrency,
+            'repos': len(self.repos),
+            'seconds': seconds,
+            'repos_per_second': round(len(self.repos) / seconds, 1) if seconds else None,
+            'requests': report['requests'],
+            'bytes': report['bytes'],
+            'statuses': dict(sorted(statuses.items())),
+            'db_seconds': report['db']['seconds'],
+            'rows_written': report['db']['rows_written'],
+        }
+
+    def run_sync(self, concurrency, use_cache, options):
+        """Run one sync and return its metrics report."""
+        with tempfile.TemporaryDirectory() as directory:
+            report_path = Path(directory) / 'report.json'
+            output = self.stdout if options['verbosity'] > 1 else io.StringIO()
+            call_command(
+                BenchSyncCommand(self.repos, self.run_ids),
+                username=USERNAME,
+                concurrency=concurrency,
+                no_cache=not use_cache,
+                quota_share=1.0,
+                contributions_source='rest',
+                stats_max_wait=options['stats_max_wait'],
+                report=str(report_path),
+                stdout=output,
+            )
+            if not report_path.exists():
+                raise CommandError('sync_github did not run (is another sync holding the lock?)')
+            return json.loads(report_path.read_text())
+
+    def print_result(self, result):
+        statuses = ' '.join(f'{status}:{count}' for status, count in result['statuses'].items())
+        self.stdout.write(
+            f'{result["mode"]:<5} x{result["concurrency"]:<3} {result["seconds"]:>7.2f}s '
+            f'{result["repos_per_second"] or 0:>7.1f} repos/s  {result["requests"]:>5} requests '
+            f'({statuses})  db {result["db_seconds"]:.2f}s, {result["rows_written"]} rows'
+        )
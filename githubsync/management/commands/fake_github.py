@@ -0,0 +1,75 @@
+"""
+Management command to run a local fake GitHub API (see githubsync.fake_api).
+
+Useful for exercising sync_github offline:
+
+    python manage.py fake_github --port 8700 --latency 80 --stats-pending 2
+    GITHUB_API_URL=http://127.0.0.1:8700 python manage.py sync_github
+
+Any repo name is served, so the projects in the database sync against it
+as they are. Note that this overwrites their snapshots with synthetic data.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from githubsync.fake_api import FakeConfig, FakeGitHub
+
+
+def add_fake_arguments(parser):
+    """Add the options configuring a ``FakeGitHub`` (shared with bench_sync)."""
+    parser.add_argument('--latency', type=float, default=0, help='Milliseconds added to every response (default: 0)')
+    parser.add_argument('--jitter', type=float, default=0, help='Up to this many more milliseconds, at random (default: 0)')
+    parser.add_argument('--no-etags', action='store_true', help="Don't send ETags, so nothing is ever a 304")
+    parser.add_argument(
+        '--stats-pending',
+        type=int,
+        default=0,
+        help='202 responses per repo before its commit stats are ready (default: 0)',
+    )
+    parser.add_argument(
+        '--forbidden-rate',
+        type=float,
+        default=0,
+        help='Share of repos answering 403, between 0 and 1 (default: 0)',
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=int,
+        default=5000,
+        help='Requests per hour before answering 403 rate limit exceeded (default: 5000)',
+    )
+    parser.add_argument('--event-pages', type=int, default=3, help='Pages of public events per user (default: 3)')
+
+
+def fake_config(options):
+    return FakeConfig(
+        latency_ms=options['latency'],
+        jitter_ms=options['jitter'],
+        etags=not options['no_etags'],
+        stats_pending=options['stats_pending'],
+        forbidden_rate=options['forbidden_rate'],
+        rate_limit=options['rate_limit'],
+        event_pages=options['event_pages'],
+    )
+
+
+class Command(BaseCommand):
+    help = 'Run a local fake GitHub API for offline sync_github runs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8700, help='Port to listen on (default: 8700)')
+        add_fake_arguments(parser)
+
+    def handle(self, *args, **options):
+        with FakeGitHub(fake_config(options), port=options['port']) as fake:
+            self.stdout.write(self.style.SUCCESS(f'Fake GitHub API listening on {fake.url}; stop with Ctrl-C'))
+            self.stdout.write(f'Run: GITHUB_API_URL={fake.url} python manage.py sync_github')
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                pass
+            statuses = ', '.join(f'{status}: {count}' for status, count in sorted(fake.statuses.items()))
+            self.stdout.write(f'Served {fake.requests} requests ({statuses or "none"})')
@@ -2,227 +2,741 @@
 Management command to sync GitHub data.
 
 Fetches:
-1. Repository snapshots for all Project repos
-2. Last 90 days of commit activity per repo
-3. Current year contributions for user bradshawrc93
+1. Repository snapshots for all Project repos (new pushes and star
+   milestones are added to the activity feed, see core.feed)
+2. The last year of commit activity per repo, as GitHub's commit stats
+   return it (the last 90 days are also rendered as a sparkline)
+3. Contributions for settings.GITHUB_USERNAME, from the GraphQL contribution
+   calendar when a token is available (the current year, or the last
+   --contribution-years years), else from public events
+
+Stored days are never pruned, so the history grows with every sync. Weekly
+and monthly rollups (see githubsync.rollups) are updated with each upsert.
+
+Repository fetches run concurrently on a bounded thread pool that shares one
+keep-alive HTTP session; all database writes happen on the main thread.
+Commit stats GitHub is still computing (202) are retried with backoff on the
+same pool and queued in PendingStatsRequest if they outlast the run.
+Responses are revalidated with ETag/Last-Modified, so unchanged endpoints
+come back as cheap 304s. Each repo's writes run in a single transaction and
+daily counters are stored with batched upserts. Cached pages built from
+GitHub data are invalidated at the end of the run if anything changed.
+
+Only one sync runs at a time across all instances: each run holds a lease in
+the SyncLock table. With --daemon the command keeps running and syncs every
+--interval seconds, skipping runs another instance has already done, and
+stops cleanly on SIGTERM.
+
+Every run is instrumented (see githubsync.metrics): per-endpoint request
+counts, latency, bytes and statuses, database time and rows written, and
+per-repo timings are stored in SyncRun and optionally written to --report.
+
+Runs stay within a share of the token's hourly rate limit (--quota-share).
+Repos are fetched stalest first, and those that don't fit the remaining
+budget are left for the next run, which will reach them first.
 """
 
-from django.core.management.base import BaseCommand
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, transaction
 from django.utils import timezone
 from datetime import datetime, timedelta
+import heapq
+import json
+import random
 import requests
 import os
-import base64
-from core.models import Project
-from githubsync.models import RepoSnapshot, RepoActivityPoint, UserContributionDay
+import signal
+import threading
+import time
+from core.feed import invalidate_feed, record_push, record_star_milestones, star_milestones
+from core.models import ContentVersion, Project
+from githubsync.client import ConditionalCache, GitHubClient, RateLimitExceeded
+from githubsync.heatmap import invalidate_heatmaps
+from githubsync.locking import SyncLease
+from githubsync.metrics import SyncMetrics
+from githubsync.models import PendingStatsRequest, RepoSnapshot, SyncLock, SyncRun
+from githubsync.ratelimit import RateBudget
+from githubsync.sparkline import refresh_sparkline
+from githubsync.upsert import UpsertStats, upsert_activity_points, upsert_contribution_days
+
+# Requests made per repo: metadata, README and commit activity
+REPO_REQUESTS = 3
+
+LOCK_NAME = 'sync_github'
+# Seconds a daemon waits before trying again when another process holds the lock
+LOCK_RETRY_SECONDS = 60
+
+# Kinds of task run on the fetch pool
+FETCH_REPO = 'repo'
+FETCH_STATS = 'stats'
+
+EVENTS_PER_PAGE = 100
+# Public events counted as contributions when the contribution calendar isn't available
+CONTRIBUTION_EVENT_TYPES = {'PushEvent', 'CreateEvent', 'PullRequestEvent', 'IssuesEvent'}
+
+
+def event_day(event):
+    """Return the day an event was created, or None if its timestamp is missing or malformed."""
+    try:
+        return datetime.fromisoformat(event['created_at'].replace('Z', '+00:00')).date()
+    except (ValueError, AttributeError, KeyError):
+        return None
+
+
+def count_event_contributions(events, contributions, year_start, year_end):
+    """Add the contribution events among ``events`` made from ``year_start`` to ``year_end`` to ``contributions``."""
+    for event in events:
+        day = event_day(event)
+        if day is not None and year_start <= day <= year_end and event.get('type') in CONTRIBUTION_EVENT_TYPES:
+            contributions[day] = contributions.get(day, 0) + 1
+
+
+@dataclass
+class RepoSyncTotals:
+    """What happened to the repos of one run."""
+    stored: int = 0
+    unchanged: int = 0
+    deferred: int = 0
+    stats_left: int = 0
+    activity: UpsertStats = field(default_factory=UpsertStats)
+
+    @property
+    def changed(self):
+        return self.stored > self.unchanged or bool(self.activity.inserted or self.activity.updated)
 
 
 class Command(BaseCommand):
+    # bench_sync overrides this so its runs never hold up (or stand in for) a real sync
+    lock_name = LOCK_NAME
     help = 'Sync GitHub repository data and user contributions'
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--username',
             type=str,
-            default='bradshawrc93',
-            help='GitHub username for contribution data (default: bradshawrc93)',
+            default=settings.GITHUB_USERNAME,
+            help=f'GitHub username for contribution data (default: {settings.GITHUB_USERNAME})',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Number of repositories fetched in parallel (default: 8)',
+        )
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='Ignore stored ETag/Last-Modified validators and refetch everything',
+        )
+        parser.add_argument(
+            '--quota-share',
+            type=float,
+            default=0.5,
+            help='Share of the hourly API rate limit this run may use (default: 0.5)',
+        )
+        parser.add_argument(
+            '--contributions-source',
+            choices=['auto', 'graphql', 'rest'],
+            default='auto',
+            help='Where to read contributions from: the GraphQL contribution calendar (needs GITHUB_TOKEN), '
+                 'public events over REST, or auto to use GraphQL when a token is set (default: auto)',
+        )
+        parser.add_argument(
+            '--contribution-years',
+            type=int,
+            default=1,
+            help='Calendar years of contributions read from GraphQL, one request each, ending with the current '
+                 'year (default: 1)',
+        )
+        parser.add_argument(
+            '--max-event-pages',
+            type=int,
+            default=10,
+            help='Maximum pages of public events read for contributions over REST (default: 10)',
+        )
+        parser.add_argument(
+            '--stats-max-wait',
+            type=float,
+            default=60,
+            help='Seconds to keep retrying commit stats GitHub is still computing after all repos are fetched '
+                 '(default: 60)',
+        )
+        parser.add_argument(
+            '--daemon',
+            action='store_true',
+            help='Keep running, syncing every --interval seconds until stopped with SIGTERM',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=3600,
+            help='Seconds between syncs in --daemon mode (default: 3600)',
+        )
+        parser.add_argument(
+            '--jitter',
+            type=int,
+            default=300,
+            help='Up to this many seconds are added to each --daemon wait, spreading out instances (default: 300)',
+        )
+        parser.add_argument(
+            '--report',
+            type=str,
+            metavar='PATH',
+            help='Write the run\'s metrics report (requests, latency, DB time, per-repo timings) to PATH as JSON',
+        )
+        parser.add_argument(
+            '--export-static',
+            type=str,
+            metavar='DIR',
+            help='After syncing, refresh the static site export in DIR (see export_static)',
         )
 
     def handle(self, *args, **options):
+        if not 0 < options['quota_share'] <= 1:
+            raise CommandError('--quota-share must be greater than 0 and at most 1')
+        if options['contribution_years'] < 1:
+            raise CommandError('--contribution-years must be at least 1')
+        if options['contributions_source'] == 'graphql' and not os.environ.get('GITHUB_TOKEN'):
+            raise CommandError('--contributions-source graphql needs GITHUB_TOKEN to be set')
+
+        # Set on SIGTERM in daemon mode; ``interrupted`` also when this run's lease is lost
+        self.shutdown = threading.Event()
+        self.interrupted = threading.Event()
+
+        if options['daemon']:
+            self.run_daemon(options)
+        elif self.run_locked(options) is None:
+            self.stdout.write(self.style.WARNING('Another sync_github run is in progress; skipping'))
+
+    def run_daemon(self, options):
+        """Sync every --interval seconds (plus jitter) until SIGTERM/SIGINT, finishing the current run first."""
+        interval = max(1, options['interval'])
+        jitter = max(0, options['jitter'])
+
+        def stop(signum, frame):
+            self.stdout.write(f'Received {signal.Signals(signum).name}, stopping after the current step...')
+            self.shutdown.set()
+            self.interrupted.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        self.stdout.write(self.style.SUCCESS(
+            f'Running sync_github every {interval}s (+ up to {jitter}s jitter); stop with SIGTERM'
+        ))
+
+        while not self.shutdown.is_set():
+            close_old_connections()
+            wait = SyncLock.seconds_until_due(self.lock_name, interval)
+            if wait <= 0:
+                try:
+                    ran = self.run_locked(options)
+                except Exception as e:
+                    # Keep the daemon alive; the next run retries
+                    self.stderr.write(f'Sync failed: {e!r}')
+                    ran = False
+                wait = LOCK_RETRY_SECONDS if ran is None else interval
+            self.shutdown.wait(wait + random.uniform(0, jitter))
+
+        self.stdout.write(self.style.SUCCESS('sync_github daemon stopped'))
+
+    def run_locked(self, options):
+        """
+        Run one sync while holding the cross-process lease.
+
+        Return True if the sync completed, False if it was interrupted, or
+        None if another process holds the lease.
+        """
+        lease = SyncLease(self.lock_name, on_lost=self.interrupted.set)
+        if not lease.acquire():
+            return None
+        if not self.shutdown.is_set():
+            self.interrupted.clear()
+        completed = False
+        try:
+            self.sync(options)
+            completed = not self.interrupted.is_set()
+        finally:
+            lease.release(completed=completed)
+        return completed
+
+    def sync(self, options):
+        """Run one sync, recording its metrics in SyncRun (and --report, if given)."""
+        metrics = SyncMetrics()
+        started_at = timezone.now()
+        status = SyncRun.FAILED
+        try:
+            with connection.execute_wrapper(metrics.db_wrapper):
+                self.fetch_and_store(options, metrics)
+            status = SyncRun.INTERRUPTED if self.interrupted.is_set() else SyncRun.COMPLETED
+        finally:
+            self.record_run(metrics, started_at, status, options['report'])
+
+        if status == SyncRun.INTERRUPTED:
+            self.stdout.write(self.style.WARNING('GitHub sync interrupted; remaining repos deferred to the next run'))
+            return
+        self.stdout.write(self.style.SUCCESS('GitHub sync completed!'))
+
+        if options['export_static']:
+            call_command('export_static', output=options['export_static'], stdout=self.stdout)
+
+    def fetch_and_store(self, options, metrics):
         username = options['username']
-        github_token = os.environ.get('GITHUB_TOKEN')
-        
-        headers = {'Accept': 'application/vnd.github.v3+json'}
-        if github_token:
-            headers['Authorization'] = f'token {github_token}'
-        
-        base_url = 'https://api.github.com'
-        
+        concurrency = max(1, options['concurrency'])
+        cache = None if options['no_cache'] else ConditionalCache()
+        budget = RateBudget(share=options['quota_share'])
+        client = GitHubClient(
+            token=os.environ.get('GITHUB_TOKEN'),
+            base_url=settings.GITHUB_API_URL,
+            pool_size=concurrency,
+            cache=cache,
+            budget=budget,
+            metrics=metrics,
+        )
+
         self.stdout.write(self.style.SUCCESS('Starting GitHub sync...'))
-        
-        # 1. Sync repository snapshots and activity for all projects
-        projects = Project.objects.all()
-        self.stdout.write(f'Syncing {projects.count()} projects...')
-        
-        for project in projects:
-            self.stdout.write(f'  Processing {project.repo_full_name}...')
-            
-            # Fetch repo snapshot
+
+        try:
             try:
-                repo_url = f'{base_url}/repos/{project.repo_full_name}'
-                response = requests.get(repo_url, headers=headers, timeout=10)
-                response.raise_for_status()
-                repo_data = response.json()
-                
-                # Parse pushed_at datetime
-                pushed_at_str = repo_data.get('pushed_at')
-                pushed_at = None
-                if pushed_at_str:
-                    try:
-                        pushed_at = datetime.fromisoformat(pushed_at_str.replace('Z', '+00:00'))
-                    except (ValueError, AttributeError):
-                        pass
-                
-                # Fetch README content
-                readme_content = ''
-                try:
-                    readme_url = f'{base_url}/repos/{project.repo_full_name}/readme'
-                    readme_response = requests.get(readme_url, headers=headers, timeout=10)
-                    if readme_response.status_code == 200:
-                        readme_data = readme_response.json()
-                        # Decode base64 content
-                        readme_content = base64.b64decode(readme_data.get('content', '')).decode('utf-8')
-                except (requests.exceptions.RequestException, ValueError, KeyError):
-                    # README might not exist or might not be accessible
-                    pass
-                
-                # Update or create RepoSnapshot
-                language = repo_data.get('language') or None  # Convert empty string to None
-                snapshot, created = RepoSnapshot.objects.update_or_create(
-                    repo_full_name=project.repo_full_name,
-                    defaults={
-                        'description': repo_data.get('description', '') or '',
-                        'language': language,
-                        'stars': repo_data.get('stargazers_count', 0),
-                        'forks': repo_data.get('forks_count', 0),
-                        'open_issues': repo_data.get('open_issues_count', 0),
-                        'pushed_at': pushed_at,
-                        'readme_content': readme_content,
-                    }
-                )
-                
-                # Fetch commit activity (last 90 days)
-                stats_url = f'{base_url}/repos/{project.repo_full_name}/stats/commit_activity'
-                stats_response = requests.get(stats_url, headers=headers, timeout=30)
-                
-                if stats_response.status_code == 200:
-                    commit_activity = stats_response.json()
-                    
-                    # Process last 90 days (approximately 13 weeks)
-                    today = timezone.now().date()
-                    cutoff_date = today - timedelta(days=90)
-                    
-                    # Clear old activity points for this repo
-                    RepoActivityPoint.objects.filter(
-                        repo_full_name=project.repo_full_name,
-                        day__lt=cutoff_date
-                    ).delete()
-                    
-                    # Process commit activity (array of weeks)
-                    for week_data in commit_activity[-13:]:  # Last 13 weeks
-                        if not week_data or 'days' not in week_data:
-                            continue
-                        
-                        week_start_timestamp = week_data.get('week', 0)
-                        week_start = datetime.fromtimestamp(week_start_timestamp).date()
-                        
-                        # Process each day in the week
-                        for day_offset, day_commits in enumerate(week_data.get('days', [])):
-                            day = week_start + timedelta(days=day_offset)
-                            
-                            # Only store if within last 90 days
-                            if day >= cutoff_date and day <= today:
-                                RepoActivityPoint.objects.update_or_create(
-                                    repo_full_name=project.repo_full_name,
-                                    day=day,
-                                    defaults={'commits': day_commits}
-                                )
-                elif stats_response.status_code == 202:
-                    self.stdout.write(
-                        self.style.WARNING(f'  Stats calculation in progress for {project.repo_full_name}')
+                client.fetch_rate_limit()
+            except (requests.exceptions.RequestException, ValueError):
+                pass  # Learned from the first response's headers instead
+            self.stdout.write(f'Rate limit: {budget}')
+
+            # 1. Fetch user contributions for current year (one bounded job, done first)
+            self.sync_contributions(
+                client, username, budget, options['max_event_pages'], options['contributions_source'],
+                options['contribution_years'],
+            )
+
+            # 2. Sync repository snapshots and activity, stalest first, within the budget
+            self.feed_changed = False
+            repos_changed = self.sync_repos(
+                client, concurrency, budget, max(0, options['stats_max_wait']), metrics
+            )
+        finally:
+            client.close()
+            if cache is not None:
+                cache.save()
+
+        self.invalidate_pages(github=repos_changed, feed=self.feed_changed)
+
+    def invalidate_pages(self, github=False, contributions=False, feed=False):
+        """Invalidate the cached pages built from the data this run changed."""
+        if github:
+            ContentVersion.bump(ContentVersion.GITHUB)
+        if contributions:
+            invalidate_heatmaps()
+        if feed:
+            invalidate_feed()
+
+    def record_run(self, metrics, started_at, status, report_path):
+        """Store the run's metrics in SyncRun, write them to ``report_path`` if given, and return the run."""
+        report = metrics.report()
+        finished_at = timezone.now()
+        report.update(started_at=started_at.isoformat(), finished_at=finished_at.isoformat(), status=status)
+        run = SyncRun.objects.create(
+            started_at=started_at,
+            finished_at=finished_at,
+            status=status,
+            duration_seconds=report['duration_seconds'],
+            requests=report['requests'],
+            bytes=report['bytes'],
+            db_seconds=report['db']['seconds'],
+            rows_written=report['db']['rows_written'],
+            report=report,
+        )
+        self.prune_runs()
+        self.stdout.write(f'Metrics: {metrics.summary()}')
+
+        if report_path:
+            with open(report_path, 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f'Wrote metrics report to {report_path}')
+        return run
+
+    def prune_runs(self):
+        SyncRun.prune()
+
+    def repo_names(self):
+        """Return the distinct repos of all projects."""
+        return list(dict.fromkeys(Project.objects.values_list('repo_full_name', flat=True)))
+
+    def prioritized_repos(self, pending):
+        """
+        Return the project repos in the order they should be fetched.
+
+        Repos never fetched come first, then repos whose commit stats were
+        still being computed last time, then the least recently fetched;
+        between equally stale repos, the one pushed to most recently is the
+        likeliest to have changed.
+        """
+        repo_names = self.repo_names()
+        snapshots = {
+            name: (fetched_at, pushed_at)
+            for name, fetched_at, pushed_at in RepoSnapshot.objects.filter(
+                repo_full_name__in=repo_names
+            ).values_list('repo_full_name', 'fetched_at', 'pushed_at')
+        }
+
+        def staleness(name):
+            if name not in snapshots:
+                return (0, 0, 0)
+            if name in pending and not pending[name].exhausted:
+                return (1, pending[name].next_attempt_at.timestamp(), 0)
+            fetched_at, pushed_at = snapshots[name]
+            return (2, fetched_at.timestamp(), -pushed_at.timestamp() if pushed_at else 0)
+
+        return sorted(repo_names, key=staleness)
+
+    def fetch_within_budget(self, client, budget, metrics, repo_full_name):
+        """Fetch a repo if its requests fit the budget; return None if it has to wait for the next run."""
+        if self.interrupted.is_set() or not budget.reserve(REPO_REQUESTS):
+            return None
+        try:
+            with metrics.fetching(repo_full_name):
+                return client.fetch_repo(repo_full_name)
+        finally:
+            budget.release(REPO_REQUESTS)
+
+    def fetch_stats_within_budget(self, client, budget, metrics, repo_full_name):
+        """Retry a repo's commit stats if the request fits the budget; return None if it doesn't."""
+        if self.interrupted.is_set() or not budget.reserve(1):
+            return None
+        try:
+            with metrics.fetching(repo_full_name):
+                return client.fetch_commit_activity(repo_full_name)
+        finally:
+            budget.release(1)
+
+    def sync_repos(self, client, concurrency, budget, stats_max_wait, metrics):
+        """
+        Fetch and store project repos within the budget; return True if any stored data changed.
+
+        Repos whose commit stats come back 202 are retried with exponential
+        backoff on the same pool while the remaining repos are fetched. Once
+        every repo is done, the run waits at most ``stats_max_wait`` seconds
+        for outstanding stats; the rest stay queued for the next run.
+        """
+        pending = {entry.repo_full_name: entry for entry in PendingStatsRequest.objects.all()}
+        repo_names = self.prioritized_repos(pending)
+        PendingStatsRequest.objects.exclude(repo_full_name__in=repo_names).delete()
+        self.stdout.write(f'Syncing {len(repo_names)} projects with concurrency {concurrency}...')
+
+        totals = RepoSyncTotals()
+        retries = []  # Heap of (monotonic due time, repo_full_name)
+        wait_until = None
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # The pool starts tasks in submission order, so the stalest repos claim the budget first
+            futures = {
+                executor.submit(self.fetch_within_budget, client, budget, metrics, name): (FETCH_REPO, name)
+                for name in repo_names
+            }
+            while futures or retries:
+                now = time.monotonic()
+                if wait_until is None and all(kind == FETCH_STATS for kind, _ in futures.values()):
+                    wait_until = now + stats_max_wait
+                if retries and (self.interrupted.is_set() or wait_until is not None and retries[0][0] > wait_until):
+                    totals.stats_left += len(retries)
+                    retries.clear()
+                while retries and retries[0][0] <= now:
+                    _, name = heapq.heappop(retries)
+                    futures[executor.submit(self.fetch_stats_within_budget, client, budget, metrics, name)] = (
+                        FETCH_STATS, name
                     )
-                
-            except requests.exceptions.RequestException as e:
-                self.stdout.write(
-                    self.style.WARNING(f'  Error fetching {project.repo_full_name}: {e}')
-                )
+
+                timeout = max(retries[0][0] - now, 0) if retries else None
+                if not futures:
+                    if timeout:
+                        self.interrupted.wait(timeout)
+                    continue
+                done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, repo_full_name = futures.pop(future)
+                    self.handle_fetched(future, kind, repo_full_name, totals, pending, retries, metrics)
+
+        self.report_totals(totals, budget)
+        return totals.changed
+
+    def handle_fetched(self, future, kind, repo_full_name, totals, pending, retries, metrics):
+        """Store the outcome of a finished repo or stats fetch and count it in ``totals``."""
+        try:
+            result = future.result()
+        except RateLimitExceeded as e:
+            totals.deferred += kind == FETCH_REPO
+            self.stdout.write(self.style.WARNING(f'  Deferred {repo_full_name}: {e}'))
+            return
+        except requests.exceptions.RequestException as e:
+            self.stdout.write(
+                self.style.WARNING(f'  Error fetching {repo_full_name}: {e}')
+            )
+            return
+
+        if kind == FETCH_STATS:
+            if result is None:
+                totals.stats_left += 1
+            else:
+                with metrics.storing(repo_full_name):
+                    totals.activity += self.store_retried_stats(repo_full_name, result, pending, retries)
+            return
+
+        if result is None:
+            totals.deferred += 1
+            return
+        self.stdout.write(f'  Processing {repo_full_name}...')
+        totals.stored += 1
+        totals.unchanged += result.not_modified
+        with metrics.storing(repo_full_name):
+            with transaction.atomic():
+                totals.activity += self.store_repo(result)
+                if result.stats_status == 200 and pending.pop(repo_full_name, None):
+                    PendingStatsRequest.objects.filter(repo_full_name=repo_full_name).delete()
+            if result.stats_status == 202:
+                self.queue_stats_retry(repo_full_name, pending, retries)
+
+    def report_totals(self, totals, budget):
+        if totals.unchanged:
+            self.stdout.write(f'  {totals.unchanged} repos unchanged since last sync (304 Not Modified)')
+        if totals.deferred:
+            reason = 'the run was interrupted' if self.interrupted.is_set() else 'of the rate limit budget'
+            self.stdout.write(self.style.WARNING(
+                f'  Deferred {totals.deferred} repos to the next run because {reason} ({budget})'
+            ))
+        if totals.stats_left:
+            self.stdout.write(self.style.WARNING(
+                f'  Commit stats for {totals.stats_left} repos still being computed; queued for the next run'
+            ))
+        self.stdout.write(f'  Activity points: {totals.activity}')
+
+    def queue_stats_retry(self, repo_full_name, pending, retries):
+        """Record a 202 for the repo and schedule a retry in this run unless it's out of attempts."""
+        entry = pending[repo_full_name] = PendingStatsRequest.record_attempt(repo_full_name)
+        if entry.exhausted:
+            self.stdout.write(self.style.WARNING(
+                f'  Stats for {repo_full_name} still not ready after {entry.attempts} attempts; '
+                f'not retrying until the next run'
+            ))
+            return
+        heapq.heappush(retries, (time.monotonic() + entry.backoff(), repo_full_name))
+
+    def store_retried_stats(self, repo_full_name, stats, pending, retries):
+        """Store the result of a stats retry; return the activity upsert stats."""
+        if stats.status_code == 202:
+            self.queue_stats_retry(repo_full_name, pending, retries)
+        elif stats.status_code == 200:
+            entry = pending.pop(repo_full_name, None)
+            with transaction.atomic():
+                upserted = self.store_commit_activity(repo_full_name, stats.data)
+                PendingStatsRequest.objects.filter(repo_full_name=repo_full_name).delete()
+            attempts = entry.attempts + 1 if entry else 1
+            self.stdout.write(f'  Stats ready for {repo_full_name} after {attempts} attempts ({upserted})')
+            return upserted
+        else:
+            self.stdout.write(self.style.WARNING(
+                f'  Error fetching stats for {repo_full_name}: {stats.status_code} response'
+            ))
+        return UpsertStats()
+
+    def store_repo(self, fetched):
+        """Store a fetched repo's snapshot and activity; return the activity upsert stats."""
+        repo_full_name = fetched.repo_full_name
+        repo_data = fetched.repo_data
+
+        # Parse pushed_at datetime
+        pushed_at_str = repo_data.get('pushed_at')
+        pushed_at = None
+        if pushed_at_str:
+            try:
+                pushed_at = datetime.fromisoformat(pushed_at_str.replace('Z', '+00:00'))
+            except (ValueError, AttributeError):
+                pass
+
+        # Update or create RepoSnapshot, keeping the previous push time and stars for the activity feed
+        language = repo_data.get('language') or None  # Convert empty string to None
+        snapshot = (
+            RepoSnapshot.objects.filter(repo_full_name=repo_full_name).first()
+            or RepoSnapshot(repo_full_name=repo_full_name)
+        )
+        created = snapshot.pk is None
+        stars = repo_data.get('stargazers_count', 0)
+        # A repo's first sync records no push and starts counting star milestones from its current stars
+        previous_pushed_at = snapshot.pushed_at
+        previous_stars = stars if created else snapshot.stars
+        pushed = (
+            not created and previous_pushed_at is not None
+            and pushed_at is not None and pushed_at != previous_pushed_at
+        )
+        snapshot.description = repo_data.get('description', '') or ''
+        snapshot.language = language
+        snapshot.stars = stars
+        snapshot.forks = repo_data.get('forks_count', 0)
+        snapshot.open_issues = repo_data.get('open_issues_count', 0)
+        snapshot.pushed_at = pushed_at
+        snapshot.readme_content = fetched.readme_content
+        snapshot.fetched_at = timezone.now()
+        snapshot.refresh_readme_html()
+        snapshot.save()
+        if created:
+            # Projects added before their repo's first sync link it now
+            Project.objects.filter(repo_full_name=repo_full_name).update(repo_snapshot=snapshot)
+
+        if pushed or star_milestones(previous_stars, snapshot.stars):
+            self.record_feed_events(snapshot, pushed, previous_stars)
+
+        if fetched.stats_error is not None:
+            self.stdout.write(
+                self.style.WARNING(f'  Error fetching {repo_full_name}: {fetched.stats_error}')
+            )
+        elif fetched.stats_status == 200:
+            return self.store_commit_activity(repo_full_name, fetched.commit_activity)
+        elif fetched.stats_status == 202:
+            self.stdout.write(f'  Stats calculation in progress for {repo_full_name}; will retry')
+        return UpsertStats()
+
+    def record_feed_events(self, snapshot, pushed, previous_stars):
+        """Add a new push or star milestones of ``snapshot``'s repo to the activity feed of its active projects."""
+        projects = Project.objects.filter(repo_full_name=snapshot.repo_full_name, status='active')
+        for project in projects:
+            if pushed:
+                record_push(project, snapshot.pushed_at)
+                self.feed_changed = True
+            if record_star_milestones(project, previous_stars, snapshot.stars, snapshot.fetched_at):
+                self.feed_changed = True
+
+    def store_commit_activity(self, repo_full_name, commit_activity):
+        # Commit stats cover the last 52 weeks; days already stored are kept, so history accumulates
+        today = timezone.now().date()
+
+        # Process commit activity (array of weeks)
+        commits_by_day = {}
+        for week_data in commit_activity:
+            if not week_data or 'days' not in week_data:
                 continue
-        
-        # 2. Fetch user contributions for current year
-        self.stdout.write(f'Syncing contributions for {username}...')
-        
+
+            week_start_timestamp = week_data.get('week', 0)
+            week_start = datetime.fromtimestamp(week_start_timestamp).date()
+
+            # Process each day in the week
+            for day_offset, day_commits in enumerate(week_data.get('days', [])):
+                day = week_start + timedelta(days=day_offset)
+
+                # The current week includes days that haven't happened yet
+                if day <= today:
+                    commits_by_day[day] = day_commits
+
+        upserted = upsert_activity_points(repo_full_name, commits_by_day)
+        refresh_sparkline(repo_full_name, today)
+        return upserted
+
+    def contributions_source(self, client, source):
+        """Resolve --contributions-source: 'auto' means GraphQL when a token is set (GraphQL requires one)."""
+        if source == 'auto':
+            return 'graphql' if client.authenticated else 'rest'
+        return source
+
+    def sync_contributions(self, client, username, budget, max_pages, requested_source, years=1):
+        source = self.contributions_source(client, requested_source)
+        self.stdout.write(f'Syncing contributions for {username} (via {source})...')
+
+        # Get current year range
+        now = timezone.now()
+        year_start = datetime(now.year, 1, 1).date()
+        year_end = datetime(now.year, 12, 31).date()
+
         try:
-            events_url = f'{base_url}/users/{username}/events/public'
-            all_contributions = {}
-            
-            # Get current year range
-            now = timezone.now()
-            year_start = datetime(now.year, 1, 1).date()
-            year_end = datetime(now.year, 12, 31).date()
-            
-            # Clear old contribution days for this user
-            UserContributionDay.objects.filter(
-                username=username,
-                day__lt=year_start
-            ).delete()
-            
-            # Fetch events (limited - GitHub API pagination)
-            # Note: This is a simplified version using events API
-            page = 1
-            per_page = 100
-            max_pages = 10  # Limit to avoid rate limits
-            
-            while page <= max_pages:
-                response = requests.get(
-                    events_url,
-                    headers=headers,
-                    params={'page': page, 'per_page': per_page},
-                    timeout=10
-                )
-                
-                if response.status_code != 200:
-                    break
-                
-                events = response.json()
-                if not events:
-                    break
-                
-                for event in events:
-                    created_at_str = event.get('created_at')
-                    if not created_at_str:
-                        continue
-                    
-                    try:
-                        event_date = datetime.fromisoformat(created_at_str.replace('Z', '+00:00')).date()
-                    except (ValueError, AttributeError):
-                        continue
-                    
-                    # Only count events from current year
-                    if year_start <= event_date <= year_end:
-                        # Count PushEvent and other contribution events
-                        event_type = event.get('type', '')
-                        if event_type in ['PushEvent', 'CreateEvent', 'PullRequestEvent', 'IssuesEvent']:
-                            all_contributions[event_date] = all_contributions.get(event_date, 0) + 1
-                
-                # Check if we've gone past current year
-                if events:
-                    try:
-                        last_event_date = datetime.fromisoformat(events[-1]['created_at'].replace('Z', '+00:00')).date()
-                        if last_event_date < year_start:
-                            break
-                    except (ValueError, AttributeError, KeyError):
-                        pass
-                
-                page += 1
-            
-            # Store contribution days
-            for day, count in all_contributions.items():
-                UserContributionDay.objects.update_or_create(
-                    username=username,
-                    day=day,
-                    defaults={'count': count}
+            all_contributions = None
+            if source == 'graphql':
+                try:
+                    all_contributions = self.fetch_calendar_contributions(client, username, years, now)
+                except requests.exceptions.RequestException as e:
+                    if requested_source != 'auto':
+                        raise
+                    self.stdout.write(
+                        self.style.WARNING(f'  GraphQL contribution calendar failed ({e}); falling back to events')
+                    )
+            if all_contributions is None:
+                all_contributions = self.fetch_event_contributions(
+                    client, username, budget, max_pages, year_start, year_end
                 )
-            
+
+            # Store contribution days; earlier years are kept for the heatmap's year selector
+            with transaction.atomic():
+                stats = upsert_contribution_days(username, all_contributions)
+                if stats.inserted or stats.updated:
+                    self.invalidate_pages(contributions=True)
+
             self.stdout.write(
                 self.style.SUCCESS(
-                    f'  Synced {len(all_contributions)} days of contributions'
+                    f'  Synced {len(all_contributions)} days of contributions ({stats})'
                 )
             )
-            
+
         except requests.exceptions.RequestException as e:
             self.stdout.write(
                 self.style.WARNING(f'  Error fetching contributions: {e}')
             )
-        
-        self.stdout.write(self.style.SUCCESS('GitHub sync completed!'))
 
+    def fetch_calendar_contributions(self, client, username, years, now):
+        """
+        Return ``{day: count}`` for the last ``years`` calendar years from the GraphQL contribution calendar.
+
+        One request covers a whole year, counts every contribution type
+        GitHub does (including private ones the token can see) and includes
+        days with no contributions, so the stored years match GitHub's.
+        """
+        contributions = {}
+        for year in range(now.year - years + 1, now.year + 1):
+            start = timezone.make_aware(datetime(year, 1, 1))
+            end = min(timezone.make_aware(datetime(year, 12, 31, 23, 59, 59)), now)
+            calendar = client.fetch_contribution_calendar(username, start, end)
+            contributions.update(
+                {day: count for day, count in calendar.items() if start.date() <= day <= end.date()}
+            )
+        return contributions
+
+    def fetch_event_contributions(self, client, username, budget, max_pages, year_start, year_end):
+        """
+        Return ``{day: count}`` estimated from the user's public events.
+
+        Works without a token, but only sees public events within GitHub's
+        events window (the last 90 days, at most 300 events).
+        """
+        contributions = {}
+        complete = False
+
+        for page in range(1, max_pages + 1):
+            events = self.fetch_events_page(client, username, budget, page)
+            if events is None:
+                break
+            if not events:
+                complete = True
+                break
+            count_event_contributions(events, contributions, year_start, year_end)
+            # Events are newest first, so a page ending before the range is the last one needed
+            last_day = event_day(events[-1])
+            if last_day is not None and last_day < year_start:
+                complete = True
+                break
+
+        if not complete and contributions:
+            # The oldest day seen may have more events on unread pages
+            del contributions[min(contributions)]
+        return contributions
+
+    def fetch_events_page(self, client, username, budget, page):
+        """Return one page of the user's public events, or None if it can't be fetched."""
+        if not budget.reserve(1):
+            self.stdout.write(self.style.WARNING(
+                f'  Stopped after {page - 1} event pages to stay within the rate limit budget'
+            ))
+            return None
+        try:
+            response = client.get_json(
+                f'/users/{username}/events/public', params={'page': page, 'per_page': EVENTS_PER_PAGE}
+            )
+        finally:
+            budget.release(1)
+        return response.data if response.status_code == 200 else None
@@ -0,0 +1,221 @@
+"""
+Instrumentation for sync_github runs.
+
+``SyncMetrics`` collects, for one run:
+
+- per endpoint type (repo, readme, stats, events, ...): request count,
+  latency, response bytes and status codes, fed by ``GitHubClient``;
+- database time and rows written, from an ``execute_wrapper`` installed on
+  the main thread's connection (where all sync writes happen);
+- per repo: requests, fetch and store time, and wall time from the start of
+  its first request to the end of its last write.
+
+``report()`` returns it all as a JSON-serializable dict; sync_github stores
+it in ``SyncRun`` and can write it to a file with ``--report``.
+"""
+
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+REPO_PATH = re.compile(r'^/repos/([^/]+/[^/]+)(/.*)?$')
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+
+def classify(path):
+    """Return ``(endpoint_type, repo_full_name or None)`` for an API path."""
+    match = REPO_PATH.match(path)
+    if match:
+        rest = match.group(2) or ''
+        if rest.startswith('/readme'):
+            return 'readme', match.group(1)
+        if rest.startswith('/stats/'):
+            return 'stats', match.group(1)
+        return ('repo' if not rest else rest.strip('/').split('/')[0]), match.group(1)
+    if '/events' in path:
+        return 'events', None
+    return path.strip('/').split('/')[0] or 'root', None
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies = []
+        self.bytes = 0
+        self.statuses = Counter()
+
+    def as_dict(self):
+        return {
+            'requests': len(self.latencies),
+            'seconds': round(sum(self.latencies), 4),
+            'p50_ms': round(percentile(self.latencies, 0.5) * 1000, 1),
+            'p95_ms': round(percentile(self.latencies, 0.95) * 1000, 1),
+            'max_ms': round(max(self.latencies, default=0) * 1000, 1),
+            'bytes': self.bytes,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+        }
+
+
+class RepoStats:
+    def __init__(self):
+        self.requests = 0
+        self.request_seconds = 0.0
+        self.bytes = 0
+        self.fetch_seconds = 0.0
+        self.store_seconds = 0.0
+        self.db_seconds = 0.0
+        self.rows_written = 0
+        self.started = None
+        self.finished = None
+
+    def as_dict(self):
+        wall = self.finished - self.started if self.started is not None and self.finished is not None else 0
+        return {
+            'requests': self.requests,
+            'request_seconds': round(self.request_seconds, 4),
+            'bytes': self.bytes,
+            'fetch_seconds': round(self.fetch_seconds, 4),
+            'store_seconds': round(self.store_seconds, 4),
+            'db_seconds': round(self.db_seconds, 4),
+            'rows_written': self.rows_written,
+            'wall_seconds': round(wall, 4),
+        }
+
+
+class SyncMetrics:
+    """Thread-safe collector for one sync run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.endpoints = defaultdict(EndpointStats)
+        self.repos = defaultdict(RepoStats)
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.db_writes = 0
+        self.db_write_seconds = 0.0
+        self.rows_written = 0
+        self.current_repo = None
+
+    def record_request(self, path, status_code, seconds, size):
+        endpoint, repo = classify(path)
+        now = time.perf_counter()
+        with self._lock:
+            stats = self.endpoints[endpoint]
+            stats.latencies.append(seconds)
+            stats.bytes += size
+            stats.statuses[status_code] += 1
+            if repo:
+                repo_stats = self.repos[repo]
+                repo_stats.requests += 1
+                repo_stats.request_seconds += seconds
+                repo_stats.bytes += size
+                self._touch(repo_stats, now - seconds, now)
+
+    def _touch(self, repo_stats, start, end):
+        if repo_stats.started is None or start < repo_stats.started:
+            repo_stats.started = start
+        if repo_stats.finished is None or end > repo_stats.finished:
+            repo_stats.finished = end
+
+    @contextmanager
+    def fetching(self, repo_full_name):
+        """Time fetching a repo (on a worker thread)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                repo_stats = self.repos[repo_full_name]
+                repo_stats.fetch_seconds += end - start
+                self._touch(repo_stats, start, end)
+
+    @contextmanager
+    def storing(self, repo_full_name):
+        """Time storing a repo (on the main thread), attributing its queries to it."""
+        start = time.perf_counter()
+        self.current_repo = repo_full_name
+        try:
+            yield
+        finally:
+            self.current_repo = None
+            end = time.perf_counter()
+            with self._lock:
+                repo_stats = self.repos[repo_full_name]
+                repo_stats.store_seconds += end - start
+                self._touch(repo_stats, start, end)
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook timing each query and counting rows it wrote."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            seconds = time.perf_counter() - start
+            is_write = sql.lstrip()[:6].upper() in WRITE_STATEMENTS
+            rows = max(context['cursor'].rowcount, 0) if is_write else 0
+            with self._lock:
+                self.db_queries += 1
+                self.db_seconds += seconds
+                if is_write:
+                    self.db_writes += 1
+                    self.db_write_seconds += seconds
+                    self.rows_written += rows
+                if self.current_repo:
+                    repo_stats = self.repos[self.current_repo]
+                    repo_stats.db_seconds += seconds
+                    repo_stats.rows_written += rows
+
+    @property
+    def requests(self):
+        return sum(len(stats.latencies) for stats in self.endpoints.values())
+
+    @property
+    def bytes(self):
+        return sum(stats.bytes for stats in self.endpoints.values())
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def report(self):
+        with self._lock:
+            return {
+                'duration_seconds': round(self.elapsed(), 4),
+                'requests': self.requests,
+                'bytes': self.bytes,
+                'endpoints': {name: stats.as_dict() for name, stats in sorted(self.endpoints.items())},
+                'db': {
+                    'queries': self.db_queries,
+                    'seconds': round(self.db_seconds, 4),
+                    'write_queries': self.db_writes,
+                    'write_seconds': round(self.db_write_seconds, 4),
+                    'rows_written': self.rows_written,
+                },
+                'repos': dict(sorted(
+                    ((name, stats.as_dict()) for name, stats in self.repos.items()),
+                    key=lambda item: item[1]['wall_seconds'],
+                    reverse=True,
+                )),
+            }
+
+    def summary(self):
+        """One-line summary for the command output."""
+        endpoints = ', '.join(f'{name} {len(stats.latencies)}' for name, stats in sorted(self.endpoints.items()))
+        line = (
+            f'{self.requests} requests ({endpoints}), {self.bytes / 1024:.0f} KiB; '
+            f'DB {self.db_seconds:.2f}s over {self.db_queries} queries, {self.rows_written} rows written; '
+            f'{self.elapsed():.2f}s total'
+        )
+        if self.repos:
+            name, stats = max(self.repos.items(), key=lambda item: item[1].as_dict()['wall_seconds'])
+            line += f'; slowest repo {name} ({stats.as_dict()["wall_seconds"]:.2f}s)'
+        return line
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('githubsync', '0004_apicacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reposnapshot',
+            name='readme_hash',
+            field=models.CharField(blank=True, help_text='Hash of the README source and renderer config readme_html was built from', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='reposnapshot',
+            name='readme_html',
+            field=models.TextField(blank=True, help_text='README rendered to HTML'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('githubsync', '0005_reposnapshot_readme_html'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reposnapshot',
+            name='fetched_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='When the repo was last fetched from GitHub'),
+        ),
+    ]
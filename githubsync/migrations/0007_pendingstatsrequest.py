@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:42
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('githubsync', '0006_reposnapshot_fetched_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingStatsRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('repo_full_name', models.CharField(max_length=200, unique=True)),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='202 responses received so far')),
+                ('first_requested_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_requested_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['next_attempt_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:45
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('githubsync', '0007_pendingstatsrequest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('owner', models.CharField(blank=True, help_text='Holder of the lease, empty when free', max_length=200)),
+                ('expires_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
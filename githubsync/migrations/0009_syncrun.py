@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('githubsync', '0008_synclock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('completed', 'Completed'), ('interrupted', 'Interrupted'), ('failed', 'Failed')], max_length=20)),
+                ('duration_seconds', models.FloatField()),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('bytes', models.PositiveBigIntegerField(default=0)),
+                ('db_seconds', models.FloatField(default=0)),
+                ('rows_written', models.PositiveIntegerField(default=0)),
+                ('report', models.JSONField(default=dict, help_text='Full metrics: per endpoint, database and per repo')),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
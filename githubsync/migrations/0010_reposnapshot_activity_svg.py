@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('githubsync', '0009_syncrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reposnapshot',
+            name='activity_end',
+            field=models.DateField(blank=True, help_text='Last day the sparkline covers', null=True),
+        ),
+        migrations.AddField(
+            model_name='reposnapshot',
+            name='activity_svg',
+            field=models.TextField(blank=True, help_text='SVG sparkline of the last 90 days of commits'),
+        ),
+        migrations.AddField(
+            model_name='reposnapshot',
+            name='activity_total',
+            field=models.IntegerField(default=0, help_text="Commits in the sparkline's 90 days"),
+        ),
+    ]
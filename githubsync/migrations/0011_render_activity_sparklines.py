@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.db import migrations
+from django.utils import timezone
+from django.utils.html import format_html
+
+# A frozen copy of githubsync.sparkline as of this migration, so later changes
+# to the app code don't change (or break) what it writes
+DAYS = 90
+HEIGHT = 40
+BAR_WIDTH = 0.8
+
+
+def render_sparkline(commits_by_day, end):
+    """Return ``(svg, total)`` for the ``DAYS`` days up to and including ``end``."""
+    start = end - timedelta(days=DAYS - 1)
+    counts = [max(commits_by_day.get(start + timedelta(days=offset), 0), 0) for offset in range(DAYS)]
+    total = sum(counts)
+    peak = max(counts)
+
+    bars = []
+    for offset, count in enumerate(counts):
+        if count:
+            height = max(round(count / peak * HEIGHT, 1), 1)
+            bars.append(f'M{offset} {HEIGHT}v-{height:g}h{BAR_WIDTH}v{height:g}z')
+
+    label = f'{total} commit{"" if total == 1 else "s"} in the last {DAYS} days'
+    svg = format_html(
+        '<svg class="sparkline" viewBox="0 0 {} {}" preserveAspectRatio="none" role="img" aria-label="{}">'
+        '<title>{}</title><path d="{}"/></svg>',
+        DAYS, HEIGHT, label, label, ''.join(bars),
+    )
+    return str(svg), total
+
+
+def render_sparklines(apps, schema_editor):
+    RepoSnapshot = apps.get_model('githubsync', 'RepoSnapshot')
+    RepoActivityPoint = apps.get_model('githubsync', 'RepoActivityPoint')
+    end = timezone.now().date()
+    points = RepoActivityPoint.objects.filter(day__gte=end - timedelta(days=DAYS - 1), day__lte=end)
+
+    commits = {}
+    for repo_full_name, day, count in points.values_list('repo_full_name', 'day', 'commits').iterator():
+        commits.setdefault(repo_full_name, {})[day] = count
+
+    snapshots = list(RepoSnapshot.objects.only('id', 'repo_full_name'))
+    for snapshot in snapshots:
+        snapshot.activity_svg, snapshot.activity_total = render_sparkline(commits.get(snapshot.repo_full_name, {}), end)
+        snapshot.activity_end = end
+    RepoSnapshot.objects.bulk_update(snapshots, ['activity_svg', 'activity_total', 'activity_end'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('githubsync', '0010_reposnapshot_activity_svg'),
+    ]
+
+    operations = [
+        migrations.RunPython(render_sparklines, migrations.RunPython.noop),
+    ]
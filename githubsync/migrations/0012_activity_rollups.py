@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('githubsync', '0011_render_activity_sparklines'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserContributionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=100)),
+                ('period', models.CharField(choices=[('week', 'Week'), ('month', 'Month')], max_length=10)),
+                ('start', models.DateField(help_text='First day of the week (a Sunday) or month')),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['username', 'period', 'start'],
+                'unique_together': {('username', 'period', 'start')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RepoActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('repo_full_name', models.CharField(max_length=200)),
+                ('period', models.CharField(choices=[('week', 'Week'), ('month', 'Month')], max_length=10)),
+                ('start', models.DateField(help_text='First day of the week (a Sunday) or month')),
+                ('commits', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['repo_full_name', 'period', 'start'],
+                'unique_together': {('repo_full_name', 'period', 'start')},
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import migrations
+
+# A frozen copy of githubsync.rollups.rebuild as of this migration, so later
+# changes to the app code don't change (or break) what it writes
+PERIODS = ('week', 'month')
+BATCH_SIZE = 500
+
+
+def period_start(day, period):
+    """Return the first day of the week (starting on Sunday) or month ``day`` falls in."""
+    if period == 'week':
+        return day - timedelta(days=(day.weekday() + 1) % 7)
+    return day.replace(day=1)
+
+
+def rebuild(rollup_model, daily_model, key_field, value_field):
+    """Write the non-empty weekly and monthly sums of every key's daily rows."""
+    totals = defaultdict(int)
+    for key, day, value in daily_model.objects.values_list(key_field, 'day', value_field).iterator():
+        for period in PERIODS:
+            totals[key, period, period_start(day, period)] += value
+
+    rollup_model.objects.all().delete()
+    rollup_model.objects.bulk_create(
+        [
+            rollup_model(**{key_field: key, 'period': period, 'start': start, value_field: total})
+            for (key, period, start), total in totals.items()
+            if total
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def build_rollups(apps, schema_editor):
+    RepoActivityPoint = apps.get_model('githubsync', 'RepoActivityPoint')
+    RepoActivityRollup = apps.get_model('githubsync', 'RepoActivityRollup')
+    UserContributionDay = apps.get_model('githubsync', 'UserContributionDay')
+    UserContributionRollup = apps.get_model('githubsync', 'UserContributionRollup')
+
+    rebuild(RepoActivityRollup, RepoActivityPoint, 'repo_full_name', 'commits')
+    rebuild(UserContributionRollup, UserContributionDay, 'username', 'count')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('githubsync', '0012_activity_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
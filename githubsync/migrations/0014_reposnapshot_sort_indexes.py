@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('githubsync', '0013_backfill_activity_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reposnapshot',
+            index=models.Index(fields=['-stars'], name='reposnapshot_stars_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reposnapshot',
+            index=models.Index(fields=['-activity_total'], name='reposnapshot_activity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reposnapshot',
+            index=models.Index(fields=['-pushed_at'], name='reposnapshot_pushed_idx'),
+        ),
+    ]
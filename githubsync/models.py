@@ -1,4 +1,9 @@
+from datetime import timedelta
+
 from django.db import models
+from django.utils import timezone
+
+from core.rendering import README_EXTENSIONS, render_hash, render_markdown
 
 
 class RepoSnapshot(models.Model):
@@ -11,18 +16,48 @@ class RepoSnapshot(models.Model):
     open_issues = models.IntegerField(default=0)
     pushed_at = models.DateTimeField(null=True, blank=True)
     readme_content = models.TextField(blank=True, help_text="README.md content from repository")
+    readme_html = models.TextField(blank=True, help_text="README rendered to HTML")
+    readme_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Hash of the README source and renderer config readme_html was built from"
+    )
+    activity_svg = models.TextField(blank=True, help_text="SVG sparkline of the last 90 days of commits")
+    activity_total = models.IntegerField(default=0, help_text="Commits in the sparkline's 90 days")
+    activity_end = models.DateField(null=True, blank=True, help_text="Last day the sparkline covers")
     updated_at = models.DateTimeField(auto_now=True)
-    fetched_at = models.DateTimeField(auto_now_add=True)
+    fetched_at = models.DateTimeField(default=timezone.now, help_text="When the repo was last fetched from GitHub")
 
     class Meta:
         ordering = ['-fetched_at']
+        indexes = [
+            # Serve the project list's sort orders (see core.views.PROJECT_SORTS)
+            models.Index(fields=['-stars'], name='reposnapshot_stars_idx'),
+            models.Index(fields=['-activity_total'], name='reposnapshot_activity_idx'),
+            models.Index(fields=['-pushed_at'], name='reposnapshot_pushed_idx'),
+        ]
 
     def __str__(self):
         return self.repo_full_name
 
+    def refresh_readme_html(self):
+        """Re-render readme_html if the README or renderer config changed. Return True if it did."""
+        readme_hash = render_hash(self.readme_content, README_EXTENSIONS)
+        if readme_hash == self.readme_hash:
+            return False
+        self.readme_html = render_markdown(self.readme_content, README_EXTENSIONS) if self.readme_content else ''
+        self.readme_hash = readme_hash
+        return True
+
+    def get_readme_html(self):
+        """Return the rendered README, re-rendering and saving it first if it's stale."""
+        if self.refresh_readme_html():
+            self.save(update_fields=['readme_html', 'readme_hash'])
+        return self.readme_html
+
 
 class RepoActivityPoint(models.Model):
-    """Cache daily commit counts for a repository."""
+    """Cache daily commit counts for a repository (full history)."""
     repo_full_name = models.CharField(max_length=200, db_index=True)
     day = models.DateField(db_index=True)
     commits = models.IntegerField(default=0)
@@ -39,7 +74,7 @@ class RepoActivityPoint(models.Model):
 
 
 class UserContributionDay(models.Model):
-    """Cache daily contribution counts for a GitHub user (current year)."""
+    """Cache daily contribution counts for a GitHub user (full history)."""
     username = models.CharField(max_length=100, db_index=True)
     day = models.DateField(db_index=True)
     count = models.IntegerField(default=0)
@@ -54,3 +89,191 @@ class UserContributionDay(models.Model):
     def __str__(self):
         return f"{self.username} - {self.day} ({self.count} contributions)"
 
+
+ROLLUP_PERIOD_CHOICES = [
+    ('week', 'Week'),
+    ('month', 'Month'),
+]
+
+
+class RepoActivityRollup(models.Model):
+    """
+    Commits of a repository per week or month, kept in step with its
+    RepoActivityPoint rows (see githubsync.rollups).
+    """
+    repo_full_name = models.CharField(max_length=200)
+    period = models.CharField(max_length=10, choices=ROLLUP_PERIOD_CHOICES)
+    start = models.DateField(help_text="First day of the week (a Sunday) or month")
+    commits = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = [['repo_full_name', 'period', 'start']]
+        ordering = ['repo_full_name', 'period', 'start']
+
+    def __str__(self):
+        return f"{self.repo_full_name} - {self.period} of {self.start} ({self.commits} commits)"
+
+
+class UserContributionRollup(models.Model):
+    """
+    Contributions of a GitHub user per week or month, kept in step with their
+    UserContributionDay rows (see githubsync.rollups).
+    """
+    username = models.CharField(max_length=100)
+    period = models.CharField(max_length=10, choices=ROLLUP_PERIOD_CHOICES)
+    start = models.DateField(help_text="First day of the week (a Sunday) or month")
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = [['username', 'period', 'start']]
+        ordering = ['username', 'period', 'start']
+
+    def __str__(self):
+        return f"{self.username} - {self.period} of {self.start} ({self.count} contributions)"
+
+
+class ApiCacheEntry(models.Model):
+    """Cache HTTP validators and the last response body for a GitHub API URL."""
+    url = models.CharField(max_length=500, unique=True)
+    etag = models.CharField(max_length=200, blank=True)
+    last_modified = models.CharField(max_length=100, blank=True)
+    body = models.JSONField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'API cache entries'
+
+    def __str__(self):
+        return self.url
+
+
+class PendingStatsRequest(models.Model):
+    """
+    A repo whose commit activity GitHub was still computing (HTTP 202).
+
+    sync_github retries these with exponential backoff while other repos are
+    processed, and puts them first in the next run if they still aren't
+    ready. The row is removed once the stats arrive.
+    """
+    BACKOFF_BASE = 2  # seconds
+    BACKOFF_MAX = 60
+    MAX_ATTEMPTS = 10
+
+    repo_full_name = models.CharField(max_length=200, unique=True)
+    attempts = models.PositiveIntegerField(default=0, help_text="202 responses received so far")
+    first_requested_at = models.DateTimeField(default=timezone.now)
+    last_requested_at = models.DateTimeField(default=timezone.now)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['next_attempt_at']
+
+    def __str__(self):
+        return f"{self.repo_full_name} ({self.attempts} attempts)"
+
+    @property
+    def exhausted(self):
+        """True once retries have been given up on; the repo's regular fetch still asks each run."""
+        return self.attempts >= self.MAX_ATTEMPTS
+
+    def backoff(self):
+        """Seconds to wait before the next attempt: doubles with each attempt, up to BACKOFF_MAX."""
+        return min(self.BACKOFF_BASE * 2 ** max(self.attempts - 1, 0), self.BACKOFF_MAX)
+
+    @classmethod
+    def record_attempt(cls, repo_full_name):
+        """Record another 202 for ``repo_full_name`` and schedule its next attempt."""
+        now = timezone.now()
+        pending, _ = cls.objects.get_or_create(repo_full_name=repo_full_name)
+        pending.attempts += 1
+        pending.last_requested_at = now
+        pending.next_attempt_at = now + timedelta(seconds=pending.backoff())
+        pending.save()
+        return pending
+
+
+class SyncLock(models.Model):
+    """
+    Named lease that lets one process at a time run a job across all instances.
+
+    A holder owns the row until ``expires_at`` and must renew it before then;
+    a crashed holder's lease simply runs out. Every step is a single
+    conditional UPDATE, so this works the same on SQLite and on PostgreSQL
+    behind a transaction-pooling proxy, where session-level advisory locks
+    can't be relied on.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    owner = models.CharField(max_length=200, blank=True, help_text="Holder of the lease, empty when free")
+    expires_at = models.DateTimeField(default=timezone.now)
+    last_completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.owner or 'free'})"
+
+    @classmethod
+    def acquire(cls, name, owner, lease):
+        """Take the lease for ``lease`` (a timedelta) if it's free or expired; return True if taken."""
+        now = timezone.now()
+        cls.objects.get_or_create(name=name)
+        return cls.objects.filter(
+            models.Q(owner='') | models.Q(owner=owner) | models.Q(expires_at__lte=now),
+            name=name,
+        ).update(owner=owner, expires_at=now + lease) == 1
+
+    @classmethod
+    def renew(cls, name, owner, lease):
+        """Extend a held lease; return False if it has been lost to another owner."""
+        return cls.objects.filter(name=name, owner=owner).update(expires_at=timezone.now() + lease) == 1
+
+    @classmethod
+    def release(cls, name, owner, completed=False):
+        """Give up the lease, recording a completed run if ``completed``."""
+        now = timezone.now()
+        fields = {'owner': '', 'expires_at': now}
+        if completed:
+            fields['last_completed_at'] = now
+        cls.objects.filter(name=name, owner=owner).update(**fields)
+
+    @classmethod
+    def seconds_until_due(cls, name, interval):
+        """Seconds until a job run every ``interval`` seconds is due again (<= 0 if it's due)."""
+        last = cls.objects.filter(name=name).values_list('last_completed_at', flat=True).first()
+        if last is None:
+            return 0
+        return interval - (timezone.now() - last).total_seconds()
+
+
+class SyncRun(models.Model):
+    """Metrics report of one sync_github run (see githubsync.metrics)."""
+    COMPLETED = 'completed'
+    INTERRUPTED = 'interrupted'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (COMPLETED, 'Completed'),
+        (INTERRUPTED, 'Interrupted'),
+        (FAILED, 'Failed'),
+    ]
+    HISTORY_LENGTH = 500
+
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    duration_seconds = models.FloatField()
+    requests = models.PositiveIntegerField(default=0)
+    bytes = models.PositiveBigIntegerField(default=0)
+    db_seconds = models.FloatField(default=0)
+    rows_written = models.PositiveIntegerField(default=0)
+    report = models.JSONField(default=dict, help_text="Full metrics: per endpoint, database and per repo")
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"{self.started_at:%Y-%m-%d %H:%M} ({self.status}, {self.duration_seconds:.1f}s)"
+
+    @classmethod
+    def prune(cls):
+        """Delete all but the most recent HISTORY_LENGTH runs."""
+        cutoff = cls.objects.values_list('started_at', flat=True)[cls.HISTORY_LENGTH:cls.HISTORY_LENGTH + 1]
+        if cutoff:
+            cls.objects.filter(started_at__lte=cutoff[0]).delete()
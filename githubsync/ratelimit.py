@@ -0,0 +1,100 @@
+"""
+GitHub API rate-limit budget for sync_github.
+
+GitHub reports the token's hourly quota on every REST response
+(``X-RateLimit-Limit``/``-Remaining``/``-Reset``) and on ``/rate_limit``,
+which doesn't count against it. ``RateBudget`` tracks those numbers and lets a
+sync spend the quota only down to a floor of ``(1 - share) * limit``, leaving
+the rest of the hour's requests to anything else using the same token.
+
+Work reserves the requests it's about to make before it starts, so concurrent
+workers can't overshoot the floor together. Work that doesn't fit is skipped
+and picked up by the next run.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+
+CORE = 'core'
+
+
+class RateBudget:
+    """Thread-safe view of the remaining REST quota and this run's share of it."""
+
+    def __init__(self, share=0.5):
+        self.share = share
+        self.limit = None
+        self.remaining = None
+        self.reset = None
+        self.reserved = 0
+        self._lock = threading.Lock()
+
+    def update(self, headers):
+        """Record the quota reported by a response's ``X-RateLimit-*`` headers."""
+        if headers.get('X-RateLimit-Resource', CORE) != CORE:
+            return
+        try:
+            limit = int(headers['X-RateLimit-Limit'])
+            remaining = int(headers['X-RateLimit-Remaining'])
+            reset = int(headers['X-RateLimit-Reset'])
+        except (KeyError, ValueError):
+            return
+        self._record(limit, remaining, reset)
+
+    def update_from_rate_limit(self, data):
+        """Record the quota from a ``/rate_limit`` response body."""
+        core = (data or {}).get('resources', {}).get(CORE)
+        if core:
+            self._record(core['limit'], core['remaining'], core['reset'])
+
+    def _record(self, limit, remaining, reset):
+        with self._lock:
+            if self.reset is not None:
+                if reset < self.reset:
+                    # A late response from the previous window
+                    return
+                if reset == self.reset:
+                    # Concurrent responses can arrive out of order; the lowest count is the latest
+                    remaining = min(remaining, self.remaining)
+            self.limit, self.remaining, self.reset = limit, remaining, reset
+
+    @property
+    def known(self):
+        return self.limit is not None
+
+    @property
+    def floor(self):
+        """Requests of the window to leave unspent."""
+        return int(self.limit * (1 - self.share)) if self.known else 0
+
+    def _available(self):
+        if not self.known:
+            return None
+        remaining = self.limit if time.time() >= self.reset else self.remaining
+        return remaining - self.floor - self.reserved
+
+    def available(self):
+        """Return how many more requests this run may start, or None while the quota is unknown."""
+        with self._lock:
+            return self._available()
+
+    def reserve(self, requests):
+        """Reserve ``requests`` calls; return False (reserving nothing) if they don't fit the budget."""
+        with self._lock:
+            available = self._available()
+            if available is not None and available < requests:
+                return False
+            self.reserved += requests
+            return True
+
+    def release(self, requests):
+        """Return a reservation once its requests have been made (their cost is in ``remaining`` by then)."""
+        with self._lock:
+            self.reserved -= requests
+
+    def __str__(self):
+        if not self.known:
+            return 'quota unknown'
+        reset = datetime.fromtimestamp(self.reset, timezone.utc).strftime('%H:%M UTC')
+        return f'{self.remaining}/{self.limit} remaining, keeping {self.floor} in reserve, resets {reset}'
@@ -0,0 +1,144 @@
+"""
+Weekly and monthly rollups of the per-day GitHub counters.
+
+``RepoActivityRollup`` and ``UserContributionRollup`` hold the sums of the
+daily rows per week (starting on Sunday, like GitHub's commit stats) and per
+calendar month. They're maintained incrementally: the upserts in
+``githubsync.upsert`` pass the change of every day they write to
+``apply_day_deltas``, which adjusts only the buckets those days fall in.
+Charts over long ranges (a year by week, all time by month) and per-year
+totals then read one row per bucket instead of every day in the range.
+
+``rebuild`` recomputes the rollups from the daily rows, for data written
+without going through the upserts (such as seed_benchmark_data).
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from githubsync.models import RepoActivityPoint, RepoActivityRollup, UserContributionDay, UserContributionRollup
+
+WEEK = 'week'
+MONTH = 'month'
+PERIODS = (WEEK, MONTH)
+
+BATCH_SIZE = 500
+
+
+def period_start(day, period):
+    """Return the first day of the week or month ``day`` falls in."""
+    if period == WEEK:
+        return day - timedelta(days=(day.weekday() + 1) % 7)
+    return day.replace(day=1)
+
+
+def next_start(start, period):
+    """Return the first day of the bucket after the one starting on ``start``."""
+    if period == WEEK:
+        return start + timedelta(days=7)
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def bucket_totals(values_by_day):
+    """Return ``{(period, start): total}`` of ``{day: value}`` for every period."""
+    totals = defaultdict(int)
+    for day, value in values_by_day.items():
+        for period in PERIODS:
+            totals[period, period_start(day, period)] += value
+    return totals
+
+
+def apply_day_deltas(rollup_model, key_field, key, value_field, deltas_by_day):
+    """Add ``{day: change}`` to the buckets of ``key``'s rollups those days fall in."""
+    deltas = {bucket: delta for bucket, delta in bucket_totals(deltas_by_day).items() if delta}
+    if not deltas:
+        return
+
+    starts = [start for _, start in deltas]
+    existing = {
+        (period, start): value
+        for period, start, value in rollup_model.objects.filter(
+            **{key_field: key},
+            start__gte=min(starts),
+            start__lte=max(starts),
+        ).values_list('period', 'start', value_field)
+    }
+    rollup_model.objects.bulk_create(
+        [
+            rollup_model(**{
+                key_field: key,
+                'period': period,
+                'start': start,
+                value_field: existing.get((period, start), 0) + delta,
+            })
+            for (period, start), delta in deltas.items()
+        ],
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=[key_field, 'period', 'start'],
+        update_fields=[value_field],
+    )
+
+
+def rebuild(rollup_model, daily_model, key_field, value_field, keys):
+    """Recompute the rollups of ``keys`` from their daily rows; return how many were written."""
+    rollup_model.objects.filter(**{f'{key_field}__in': keys}).delete()
+
+    values_by_key = defaultdict(dict)
+    for key, day, value in daily_model.objects.filter(**{f'{key_field}__in': keys}).values_list(
+        key_field, 'day', value_field
+    ).iterator():
+        values_by_key[key][day] = value
+
+    # Like the incremental updates, leave out empty buckets: readers count missing ones as 0
+    rows = [
+        rollup_model(**{key_field: key, 'period': period, 'start': start, value_field: total})
+        for key, values_by_day in values_by_key.items()
+        for (period, start), total in bucket_totals(values_by_day).items()
+        if total
+    ]
+    rollup_model.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(rows)
+
+
+def rebuild_activity(repo_names):
+    return rebuild(RepoActivityRollup, RepoActivityPoint, 'repo_full_name', 'commits', repo_names)
+
+
+def rebuild_contributions(usernames):
+    return rebuild(UserContributionRollup, UserContributionDay, 'username', 'count', usernames)
+
+
+def activity_series(repo_full_name, period, start, end):
+    """Return ``[(bucket_start, commits)]`` for every bucket from ``start`` to ``end``, empty ones included."""
+    first = period_start(start, period)
+    stored = dict(RepoActivityRollup.objects.filter(
+        repo_full_name=repo_full_name,
+        period=period,
+        start__gte=first,
+        start__lte=end,
+    ).values_list('start', 'commits'))
+
+    series, bucket = [], first
+    while bucket <= end:
+        series.append((bucket, stored.get(bucket, 0)))
+        bucket = next_start(bucket, period)
+    return series
+
+
+def first_activity_month(repo_full_name):
+    """Return the first month with stored activity for the repo, or None."""
+    return RepoActivityRollup.objects.filter(
+        repo_full_name=repo_full_name,
+        period=MONTH,
+    ).order_by('start').values_list('start', flat=True).first()
+
+
+def contribution_year_totals(username):
+    """Return ``{year: contributions}`` for every year with stored contribution days."""
+    totals = defaultdict(int)
+    for start, count in UserContributionRollup.objects.filter(username=username, period=MONTH).values_list(
+        'start', 'count'
+    ):
+        totals[start.year] += count
+    return dict(sorted(totals.items()))
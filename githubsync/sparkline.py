@@ -0,0 +1,125 @@
+"""
+Commit activity sparklines for the project pages.
+
+sync_github renders a repo's 90-day sparkline once per sync, right after
+storing its activity, and keeps it on the ``RepoSnapshot`` with the window's
+commit total. The project detail page and the project list cards embed it
+as-is, without reading ``RepoActivityPoint`` rows or looping over days in a
+template.
+
+The longer ranges of the project detail page (``RANGES``) are drawn from
+the weekly and monthly rollups (see githubsync.rollups) when requested: at
+most one row per bar, so a year or all time costs about as much as 90 days.
+
+The SVG is a single path with a bar per day (or week, or month) that had
+commits, in a viewBox one unit wide per bar that the page stretches to its
+container.
+"""
+
+from datetime import timedelta
+
+from django.utils.html import format_html
+
+from githubsync.models import RepoActivityPoint, RepoSnapshot
+from githubsync.rollups import MONTH, WEEK, activity_series, first_activity_month
+
+DAYS = 90
+HEIGHT = 40
+BAR_WIDTH = 0.8
+LABEL_EVERY = 15
+# Axis labels under the longer ranges
+MAX_LABELS = 7
+
+RANGE_90_DAYS = '90d'
+RANGE_YEAR = '1y'
+RANGE_ALL = 'all'
+RANGES = {
+    RANGE_90_DAYS: 'Last 90 Days',
+    RANGE_YEAR: 'Last Year',
+    RANGE_ALL: 'All Time',
+}
+
+
+def render_bars(counts, label):
+    """Return the SVG of a bar chart of ``counts``, labelled ``label`` for assistive technology."""
+    counts = [max(count, 0) for count in counts]
+    peak = max(counts, default=0)
+
+    bars = []
+    for offset, count in enumerate(counts):
+        if count:
+            height = max(round(count / peak * HEIGHT, 1), 1)
+            bars.append(f'M{offset} {HEIGHT}v-{height:g}h{BAR_WIDTH}v{height:g}z')
+
+    svg = format_html(
+        '<svg class="sparkline" viewBox="0 0 {} {}" preserveAspectRatio="none" role="img" aria-label="{}">'
+        '<title>{}</title><path d="{}"/></svg>',
+        max(len(counts), 1), HEIGHT, label, label, ''.join(bars),
+    )
+    return str(svg)
+
+
+def commits_label(total, period):
+    return f'{total} commit{"" if total == 1 else "s"} {period}'
+
+
+def render_sparkline(commits_by_day, end, days=DAYS):
+    """Return ``(svg, total)`` for the ``days`` days up to and including ``end``."""
+    start = end - timedelta(days=days - 1)
+    counts = [max(commits_by_day.get(start + timedelta(days=offset), 0), 0) for offset in range(days)]
+    total = sum(counts)
+    return render_bars(counts, commits_label(total, f'in the last {days} days')), total
+
+
+def refresh_sparkline(repo_full_name, end):
+    """Re-render a repo's sparkline from its stored activity and save it on its snapshot."""
+    start = end - timedelta(days=DAYS - 1)
+    commits_by_day = dict(RepoActivityPoint.objects.filter(
+        repo_full_name=repo_full_name,
+        day__gte=start,
+        day__lte=end,
+    ).values_list('day', 'commits'))
+    svg, total = render_sparkline(commits_by_day, end)
+    RepoSnapshot.objects.filter(repo_full_name=repo_full_name).update(
+        activity_svg=svg,
+        activity_total=total,
+        activity_end=end,
+    )
+
+
+def bar_labels(starts, every):
+    """Return ``[(left_percent, start)]`` for every ``every``-th of the bars starting on ``starts``, and the last."""
+    last = len(starts) - 1
+    offsets = list(range(0, len(starts), every))
+    if offsets and offsets[-1] != last:
+        offsets.append(last)
+    return [(round(offset / max(last, 1) * 100, 2), starts[offset]) for offset in offsets]
+
+
+def axis_labels(end, days=DAYS, every=LABEL_EVERY):
+    """Return ``[(left_percent, day)]`` for the date labels under a sparkline ending on ``end``."""
+    start = end - timedelta(days=days - 1)
+    return bar_labels([start + timedelta(days=offset) for offset in range(days)], every)
+
+
+def render_range(repo_full_name, activity_range, end):
+    """
+    Return ``(svg, axis)`` of a repo's activity over ``RANGE_YEAR`` (by week)
+    or ``RANGE_ALL`` (by month, from its first month with activity) up to
+    ``end``, read from the rollups. Both are empty if nothing is stored.
+    """
+    if activity_range == RANGE_YEAR:
+        period, start, description = WEEK, end - timedelta(days=364), 'in the last year'
+    else:
+        period, start, description = MONTH, first_activity_month(repo_full_name), 'in total'
+        if start is None:
+            return '', []
+
+    series = activity_series(repo_full_name, period, start, end)
+    starts = [bucket for bucket, _ in series]
+    counts = [commits for _, commits in series]
+    total = sum(counts)
+    if not total:
+        return '', []
+    every = -(-len(series) // (MAX_LABELS - 1))
+    return render_bars(counts, commits_label(total, description)), bar_labels(starts, every)
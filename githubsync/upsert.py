@@ -0,0 +1,89 @@
+"""
+Batched upserts for the per-day GitHub counters.
+
+Each call reads the existing rows for the affected day range once, then
+writes only new or changed rows with ``bulk_create(update_conflicts=True)``
+on the model's ``unique_together`` key. A sync makes one SELECT and one
+INSERT ... ON CONFLICT per batch, instead of a round-trip per day.
+
+The change to each day is then applied to the weekly and monthly rollups
+(see ``githubsync.rollups``), which costs one more SELECT and upsert.
+"""
+
+from dataclasses import dataclass
+
+from githubsync.models import RepoActivityPoint, RepoActivityRollup, UserContributionDay, UserContributionRollup
+from githubsync.rollups import apply_day_deltas
+
+BATCH_SIZE = 500
+
+
+@dataclass
+class UpsertStats:
+    """Row counts for one or more upserts."""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def __iadd__(self, other):
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        return self
+
+    def __str__(self):
+        return f'{self.inserted} inserted, {self.updated} updated, {self.unchanged} unchanged'
+
+
+def upsert_daily_counts(model, key_field, key, value_field, values_by_day, rollup_model=None, batch_size=BATCH_SIZE):
+    """Upsert ``{day: value}`` rows of ``model`` for a single ``key_field`` value, updating ``rollup_model``."""
+    stats = UpsertStats()
+    if not values_by_day:
+        return stats
+
+    existing = dict(
+        model.objects.filter(
+            **{key_field: key},
+            day__gte=min(values_by_day),
+            day__lte=max(values_by_day),
+        ).values_list('day', value_field)
+    )
+
+    rows = []
+    deltas = {}
+    for day, value in values_by_day.items():
+        if day not in existing:
+            stats.inserted += 1
+        elif existing[day] != value:
+            stats.updated += 1
+        else:
+            stats.unchanged += 1
+            continue
+        rows.append(model(**{key_field: key, 'day': day, value_field: value}))
+        deltas[day] = value - existing.get(day, 0)
+
+    if rows:
+        model.objects.bulk_create(
+            rows,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=[key_field, 'day'],
+            update_fields=[value_field],
+        )
+        if rollup_model is not None:
+            apply_day_deltas(rollup_model, key_field, key, value_field, deltas)
+    return stats
+
+
+def upsert_activity_points(repo_full_name, commits_by_day):
+    """Upsert daily commit counts for a repository."""
+    return upsert_daily_counts(
+        RepoActivityPoint, 'repo_full_name', repo_full_name, 'commits', commits_by_day, RepoActivityRollup
+    )
+
+
+def upsert_contribution_days(username, counts_by_day):
+    """Upsert daily contribution counts for a user."""
+    return upsert_daily_counts(
+        UserContributionDay, 'username', username, 'count', counts_by_day, UserContributionRollup
+    )
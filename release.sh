@@ -9,3 +9,6 @@ python manage.py migrate --no-input
 
 echo "Migrations complete!"
 
+# Fill the full-text index on the first deploy; saves keep it current after that
+python manage.py rebuild_search_index --if-empty
+
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ('title', 'kind', 'public', 'url', 'updated_at')
+    list_filter = ('kind', 'public')
+    readonly_fields = ('updated_at',)
+    ordering = ('kind', 'title')
@@ -0,0 +1,198 @@
+"""
+Full-text index over devlog posts and project READMEs.
+
+Documents are upserted into ``SearchDocument`` whenever their source changes;
+the database keeps its inverted index current from there (FTS5 triggers on
+SQLite, a generated tsvector column on PostgreSQL). Queries use that index and
+are ranked by the database, with titles weighted above tags and tags above
+body text. Other databases fall back to substring matching.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from core.models import Project
+from devlog.models import DevlogPost
+from githubsync.models import RepoSnapshot
+from .models import SearchDocument
+
+DEVLOG = 'devlog'
+PROJECT = 'project'
+
+FTS_TABLE = 'search_searchdocument_fts'
+MAX_TERMS = 10
+SNIPPET_CHARS = 200
+
+
+def upsert_document(kind, object_id, **fields):
+    """Create or update a document, skipping the write if nothing changed."""
+    document = SearchDocument.objects.filter(kind=kind, object_id=object_id).first()
+    if document is None:
+        SearchDocument.objects.create(kind=kind, object_id=object_id, **fields)
+    elif any(getattr(document, name) != value for name, value in fields.items()):
+        for name, value in fields.items():
+            setattr(document, name, value)
+        document.save()
+
+
+def remove_document(kind, object_id):
+    SearchDocument.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def index_devlog_post(post):
+    upsert_document(
+        DEVLOG,
+        post.pk,
+        title=post.title,
+        tags=', '.join(tag.name for tag in post.tags.all()),
+        body=post.content_md,
+        url=post.get_absolute_url(),
+        public=post.is_published,
+    )
+
+
+def index_project(project, snapshot=None):
+    if snapshot is None:
+        snapshot = RepoSnapshot.objects.filter(repo_full_name=project.repo_full_name).first()
+    body = [project.tagline]
+    if snapshot:
+        body += [snapshot.description, snapshot.readme_content]
+    upsert_document(
+        PROJECT,
+        project.pk,
+        title=project.title,
+        tags=', '.join(tag.name for tag in project.stack.all()),
+        body='\n\n'.join(part for part in body if part),
+        url=project.get_absolute_url(),
+        public=project.status == 'active',
+    )
+
+
+def rebuild():
+    """Re-index every devlog post and project from scratch."""
+    SearchDocument.objects.all().delete()
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')")
+
+    for post in DevlogPost.objects.prefetch_related('tags'):
+        index_devlog_post(post)
+    snapshots = {snapshot.repo_full_name: snapshot for snapshot in RepoSnapshot.objects.all()}
+    for project in Project.objects.prefetch_related('stack'):
+        index_project(project, snapshots.get(project.repo_full_name))
+    return SearchDocument.objects.count()
+
+
+def parse_terms(query):
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+
+def match_sql(terms, kind, public_only):
+    """
+    Return ``(sql, params, order)`` selecting ``id, rank`` of the documents
+    matching ``terms`` through the database's index, or None if it has none.
+    """
+    filters, params = [], []
+    if kind:
+        filters.append('d.kind = %s')
+        params.append(kind)
+    if public_only:
+        filters.append('d.public')
+    where = ''.join(f' AND {condition}' for condition in filters)
+
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        sql = (
+            f'SELECT d.id, bm25({FTS_TABLE}, 10.0, 5.0, 1.0) AS rank '
+            f'FROM {FTS_TABLE} JOIN search_searchdocument d ON d.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s{where}'
+        )
+        return sql, [match, *params], 'rank'
+    if connection.vendor == 'postgresql':
+        match = ' & '.join(f'{term}:*' for term in terms)
+        sql = (
+            "SELECT d.id, ts_rank(d.search_vector, q.query) AS rank "
+            "FROM search_searchdocument d, to_tsquery('english', %s) AS q(query) "
+            f"WHERE d.search_vector @@ q.query{where}"
+        )
+        return sql, [match, *params], 'rank DESC'
+    return None
+
+
+def substring_matches(terms, kind, public_only):
+    """Documents containing every term in their title or body, for databases without a full-text index."""
+    documents = SearchDocument.objects.all()
+    if kind:
+        documents = documents.filter(kind=kind)
+    if public_only:
+        documents = documents.filter(public=True)
+    for term in terms:
+        documents = documents.filter(title__icontains=term) | documents.filter(body__icontains=term)
+    return documents
+
+
+def matching_ids(query, kind=None, public_only=True, limit=20):
+    """Return ``[(document_id, rank)]`` for ``query``, best match first."""
+    terms = parse_terms(query)
+    if not terms:
+        return []
+
+    matched = match_sql(terms, kind, public_only)
+    if matched is None:
+        return [(pk, 0) for pk in substring_matches(terms, kind, public_only).values_list('pk', flat=True)[:limit]]
+
+    sql, params, order = matched
+    with connection.cursor() as cursor:
+        cursor.execute(f'{sql} ORDER BY {order} LIMIT %s', [*params, limit])
+        return cursor.fetchall()
+
+
+def matching_documents(query, kind=None, public_only=True):
+    """Return every document matching ``query`` as an unranked queryset, to filter other querysets by."""
+    terms = parse_terms(query)
+    if not terms:
+        return SearchDocument.objects.none()
+
+    matched = match_sql(terms, kind, public_only)
+    if matched is None:
+        return substring_matches(terms, kind, public_only)
+    sql, params, _ = matched
+    return SearchDocument.objects.filter(pk__in=RawSQL(f'SELECT id FROM ({sql}) AS matches', params))
+
+
+def make_snippet(body, terms):
+    """Return an HTML excerpt of ``body`` around the first matching term, with matches highlighted."""
+    lowered = body.lower()
+    positions = [lowered.find(term) for term in terms if term in lowered]
+    start = max(min(positions) - SNIPPET_CHARS // 4, 0) if positions else 0
+    excerpt = body[start:start + SNIPPET_CHARS]
+
+    pattern = re.compile('|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    html, last = [], 0
+    for match in pattern.finditer(excerpt):
+        html.append(escape(excerpt[last:match.start()]))
+        html.append(f'<mark>{escape(match.group())}</mark>')
+        last = match.end()
+    html.append(escape(excerpt[last:]))
+
+    prefix = '&hellip;' if start else ''
+    suffix = '&hellip;' if start + SNIPPET_CHARS < len(body) else ''
+    return mark_safe(f'{prefix}{"".join(html)}{suffix}')
+
+
+def search(query, kind=None, limit=20):
+    """Return public documents matching ``query`` with ``rank`` and ``snippet`` attached."""
+    ranked = matching_ids(query, kind=kind, limit=limit)
+    documents = SearchDocument.objects.in_bulk([pk for pk, _ in ranked])
+    terms = parse_terms(query)
+    results = []
+    for pk, rank in ranked:
+        document = documents[pk]
+        document.rank = rank
+        document.snippet = make_snippet(document.body, terms)
+        results.append(document)
+    return results
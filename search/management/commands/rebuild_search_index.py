@@ -0,0 +1,29 @@
+"""
+Management command to rebuild the full-text search index.
+
+The index is kept current incrementally on save and during sync_github; this
+is only needed after bulk imports that bypass model signals, and to fill the
+index the first time (the deploy scripts run it with --if-empty).
+"""
+
+from django.core.management.base import BaseCommand
+from search import index
+from search.models import SearchDocument
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for devlog posts and projects'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--if-empty',
+            action='store_true',
+            help='Only build the index if it has no documents yet',
+        )
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and SearchDocument.objects.exists():
+            self.stdout.write('Search index already built; skipping')
+            return
+        count = index.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} documents'))
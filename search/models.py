@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Denormalized, searchable copy of a devlog post or project.
+
+    The full-text index itself is database specific and created in the
+    migrations: an FTS5 table kept in sync by triggers on SQLite, and a
+    generated tsvector column with a GIN index on PostgreSQL.
+    """
+    KIND_CHOICES = [
+        ('devlog', 'Devlog post'),
+        ('project', 'Project'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    title = models.CharField(max_length=200)
+    tags = models.CharField(max_length=500, blank=True)
+    body = models.TextField(blank=True)
+    url = models.CharField(max_length=300)
+    public = models.BooleanField(default=False, help_text="Shown in public search results")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [['kind', 'object_id']]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
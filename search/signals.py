@@ -0,0 +1,79 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from core.models import Project, Tag
+from devlog.models import DevlogPost
+from githubsync.models import RepoSnapshot
+from . import index
+
+# Fields written when stored HTML is re-rendered; the searchable text is unchanged
+RENDER_FIELDS = {'content_html', 'content_hash', 'readme_html', 'readme_hash'}
+
+
+def is_render_only(update_fields):
+    return bool(update_fields) and set(update_fields) <= RENDER_FIELDS
+
+
+@receiver(post_save, sender=DevlogPost)
+def index_devlog_post(sender, instance, update_fields=None, **kwargs):
+    if not is_render_only(update_fields):
+        index.index_devlog_post(instance)
+
+
+@receiver(post_delete, sender=DevlogPost)
+def remove_devlog_post(sender, instance, **kwargs):
+    index.remove_document(index.DEVLOG, instance.pk)
+
+
+@receiver(post_save, sender=Project)
+def index_project(sender, instance, **kwargs):
+    index.index_project(instance)
+
+
+@receiver(post_delete, sender=Project)
+def remove_project(sender, instance, **kwargs):
+    index.remove_document(index.PROJECT, instance.pk)
+
+
+@receiver(post_save, sender=RepoSnapshot)
+def index_snapshot_projects(sender, instance, update_fields=None, **kwargs):
+    if is_render_only(update_fields):
+        return
+    for project in Project.objects.filter(repo_full_name=instance.repo_full_name):
+        index.index_project(project, instance)
+
+
+@receiver(m2m_changed, sender=DevlogPost.tags.through)
+@receiver(m2m_changed, sender=Project.stack.through)
+def index_retagged(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        reindex([instance])
+    elif pk_set:
+        reindex(model.objects.filter(pk__in=pk_set))
+
+
+@receiver(post_save, sender=Tag)
+def index_renamed_tag(sender, instance, created, **kwargs):
+    if not created:
+        reindex(instance.projects.all())
+        reindex(instance.devlog_posts.all())
+
+
+@receiver(pre_delete, sender=Tag)
+def collect_tagged(sender, instance, **kwargs):
+    # The M2M rows are gone by post_delete, so note what to re-index now
+    instance._tagged = list(instance.projects.all()) + list(instance.devlog_posts.all())
+
+
+@receiver(post_delete, sender=Tag)
+def index_untagged(sender, instance, **kwargs):
+    reindex(getattr(instance, '_tagged', []))
+
+
+def reindex(objects):
+    for obj in objects:
+        if isinstance(obj, DevlogPost):
+            index.index_devlog_post(obj)
+        else:
+            index.index_project(obj)
@@ -0,0 +1,14 @@
+from django.shortcuts import render
+from . import index
+
+
+def search(request):
+    """Full-text search across devlog posts and project READMEs."""
+    query = request.GET.get('q', '').strip()
+    results = index.search(query) if query else []
+
+    context = {
+        'query': query,
+        'results': results,
+    }
+    return render(request, 'search/results.html', context)